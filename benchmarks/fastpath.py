@@ -0,0 +1,46 @@
+"""
+Compare the per call cost of the validated and unchecked _TileGrid methods.
+
+Usage:
+    python -m benchmarks.fastpath [--number N]
+"""
+import argparse
+import timeit
+
+from gatilegrid import GeoadminTileGridLV95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=200000, help='calls per measure')
+    args = parser.parse_args()
+
+    grid = GeoadminTileGridLV95()
+    zoom = 22
+    point = [2600000.5, 1200000.5]
+    [col, row] = grid.tileAddress(zoom, point)
+    cases = [
+        ('tileSize', lambda: grid.tileSize(zoom), lambda: grid.tileSizeUnchecked(zoom)),
+        (
+            'tileBounds',
+            lambda: grid.tileBounds(zoom, col, row),
+            lambda: grid.tileBoundsUnchecked(zoom, col, row)
+        ),
+        (
+            'tileAddress',
+            lambda: grid.tileAddress(zoom, point),
+            lambda: grid.tileAddressUnchecked(zoom, point)
+        ),
+    ]
+
+    print(f'{"method":<14}{"checked ns":>14}{"unchecked ns":>14}{"saving":>10}')
+    for name, checked, unchecked in cases:
+        checkedNs = min(timeit.repeat(checked, number=args.number, repeat=5)) / args.number * 1e9
+        uncheckedNs = min(timeit.repeat(unchecked, number=args.number,
+                                        repeat=5)) / args.number * 1e9
+        saving = 1 - uncheckedNs / checkedNs
+        print(f'{name:<14}{checkedNs:>14.1f}{uncheckedNs:>14.1f}{saving:>10.0%}')
+
+
+if __name__ == '__main__':
+    main()
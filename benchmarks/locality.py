@@ -0,0 +1,76 @@
+"""
+Compare the cache hit rate of a locality sensitive consumer for the
+iterGrid orders. Each tile reads the source chunks of its 3x3 tiles
+neighbourhood through an LRU cache, as a renderer with a metatile buffer
+would.
+
+Usage:
+    python -m benchmarks.locality [--grid lv95 --zoom Z] [--cache-size N]
+                                  [--max-tiles N]
+"""
+import argparse
+import itertools
+import time
+from collections import OrderedDict
+
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import GlobalMercatorTileGrid
+
+ORDERS = ('row-major', 'z-order', 'hilbert')
+# Grid name, grid class and default zoom
+GRIDS = (('lv95', GeoadminTileGridLV95, 22), ('mercator', GlobalMercatorTileGrid, 13))
+
+
+def hitRate(tiles, cacheSize):
+    cache = OrderedDict()
+    hits = misses = 0
+    for col, row in tiles:
+        for chunk in ((c, r) for c in (col - 1, col, col + 1) for r in (row - 1, row, row + 1)):
+            if chunk in cache:
+                cache.move_to_end(chunk)
+                hits += 1
+            else:
+                misses += 1
+                cache[chunk] = True
+                if len(cache) > cacheSize:
+                    cache.popitem(last=False)
+    return hits / (hits + misses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--grid', choices=[name for name, _, _ in GRIDS], default=None,
+        help='only run this grid'
+    )
+    parser.add_argument('--zoom', type=int, default=None, help='zoom level, requires --grid')
+    parser.add_argument('--cache-size', type=int, default=256, help='LRU cache size in chunks')
+    parser.add_argument(
+        '--max-tiles', type=int, default=1000000, help='only read the first tiles of each order'
+    )
+    args = parser.parse_args()
+    if args.zoom is not None and args.grid is None:
+        parser.error('--zoom requires --grid')
+
+    print(f'{"grid":<24}{"zoom":>6}{"tiles":>10}{"order":>12}{"hit rate":>10}{"seconds":>10}')
+    for name, gridClass, zoom in GRIDS:
+        if args.grid is not None and args.grid != name:
+            continue
+        grid = gridClass()
+        zoom = zoom if args.zoom is None else args.zoom
+        for order in ORDERS:
+            start = time.perf_counter()
+            tiles = [
+                (c, r) for (b, z, c, r) in
+                itertools.islice(grid.iterGrid(zoom, zoom, order=order), args.max_tiles)
+            ]
+            elapsed = time.perf_counter() - start
+            rate = hitRate(tiles, args.cache_size)
+            print(
+                f'{type(grid).__name__:<24}{zoom:>6}{len(tiles):>10}{order:>12}'
+                f'{rate:>10.1%}{elapsed:>10.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
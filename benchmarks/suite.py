@@ -0,0 +1,223 @@
+"""
+Benchmark the public hot paths of the tile grids and of the grid for the
+four supported tile grids at a low and a high zoom level. Reports the
+throughput and the peak memory of each case.
+
+Usage:
+    python -m benchmarks.suite [--number N] [--filter NAME] [--json out.json]
+                               [--compare baseline.json] [--tolerance 0.2]
+
+With --compare, the exit code is 1 if any case is slower than the baseline
+by more than the tolerance.
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from gatilegrid import Grid
+from gatilegrid import GeoadminTileGridLV03
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import GlobalGeodeticTileGrid
+from gatilegrid import GlobalMercatorTileGrid
+
+GRIDS = (GeoadminTileGridLV03, GeoadminTileGridLV95, GlobalMercatorTileGrid, GlobalGeodeticTileGrid)
+
+
+def _randomPoints(extent, nb):
+    return [[random.uniform(extent[0], extent[2]),
+             random.uniform(extent[1], extent[3])] for _ in range(nb)]
+
+
+def _randomExtents(extent, nb):
+    extents = []
+    for [x, y] in _randomPoints(extent, nb):
+        extents.append([
+            x, y,
+            x + random.uniform(0, extent[2] - x) / 10.0,
+            y + random.uniform(0, extent[3] - y) / 10.0
+        ])
+    return extents
+
+
+def tileGridCases(grid, zoom, number):
+    """
+    Yields (name, callable) for a tile grid and a zoom, the callables do up
+    to number operations and return the number done
+    """
+    points = _randomPoints(grid.extent, number)
+    addresses = [grid.tileAddress(zoom, p) for p in points]
+    extents = _randomExtents(grid.extent, number)
+    parentZoom = zoom // 2
+    resolutions = [random.uniform(grid.RESOLUTIONS[-1], grid.RESOLUTIONS[0]) for _ in range(number)]
+
+    def tileAddress():
+        for point in points:
+            grid.tileAddress(zoom, point)
+        return len(points)
+
+    def tileBounds():
+        for [col, row] in addresses:
+            grid.tileBounds(zoom, col, row)
+        return len(addresses)
+
+    def iterGrid():
+        # Low zoom levels have fewer than number tiles
+        nbTiles = 0
+        for tile in itertools.islice(grid.iterGrid(zoom, zoom), number):
+            nbTiles += 1
+        return nbTiles
+
+    def getExtentAddress():
+        for extent in extents:
+            grid.getExtentAddress(zoom, extent=extent)
+        return len(extents)
+
+    def getParentTiles():
+        for [col, row] in addresses:
+            grid.getParentTiles(zoom, col, row, parentZoom)
+        return len(addresses)
+
+    def getClosestZoom():
+        for resolution in resolutions:
+            grid.getClosestZoom(resolution)
+        return len(resolutions)
+
+    yield ('tileAddress', tileAddress)
+    yield ('tileBounds', tileBounds)
+    yield ('iterGrid', iterGrid)
+    yield ('getExtentAddress', getExtentAddress)
+    yield ('getParentTiles', getParentTiles)
+    yield ('getClosestZoom', getClosestZoom)
+
+
+def gridCases(grid, number):
+    "Yields (name, callable) for a Grid, like tileGridCases"
+    points = _randomPoints(grid.extent, number)
+
+    def gridIter():
+        nbCells = 0
+        for cell in itertools.islice(grid, number):
+            nbCells += 1
+        return nbCells
+
+    def cellAddressFromPointCoordinate():
+        for point in points:
+            grid.cellAddressFromPointCoordinate(point)
+        return len(points)
+
+    yield ('Grid.__iter__', gridIter)
+    yield ('Grid.cellAddressFromPointCoordinate', cellAddressFromPointCoordinate)
+
+
+def iterCases(number):
+    "Yields (name, gridName, zoom, callable) for all the benchmarked cases"
+    for gridClass in GRIDS:
+        grid = gridClass()
+        lowZoom = len(grid.RESOLUTIONS) // 4
+        highZoom = len(grid.RESOLUTIONS) - 1
+        for zoom in (lowZoom, highZoom):
+            for name, func in tileGridCases(grid, zoom, number):
+                yield (name, gridClass.__name__, zoom, func)
+        # A grid of about 1000 x 1000 cells over the tile grid extent
+        resolution = (grid.extent[2] - grid.extent[0]) / 1000.0
+        cellGrid = Grid(grid.extent, resolution, -resolution)
+        for name, func in gridCases(cellGrid, number):
+            yield (name, gridClass.__name__, None, func)
+
+
+def measure(func, repeat):
+    """
+    Return the best throughput (operations per second), the number of
+    operations of a run and the peak memory
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        number = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return number / best, number, peakMemory
+
+
+def caseKey(result):
+    return f'{result["name"]}|{result["grid"]}|{result["zoom"]}'
+
+
+def compare(results, baseline, tolerance):
+    "Print the throughput ratios against a baseline and return the regressions"
+    baselineResults = {caseKey(r): r for r in baseline['results']}
+    regressions = []
+    print(f'\n{"case":<64}{"ratio":>8}')
+    for result in results:
+        reference = baselineResults.get(caseKey(result))
+        if reference is None:
+            continue
+        ratio = result['opsPerSecond'] / reference['opsPerSecond']
+        flag = ''
+        if ratio < 1 - tolerance:
+            regressions.append(result)
+            flag = '  REGRESSION'
+        print(f'{caseKey(result):<64}{ratio:>8.2f}{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--number', type=int, default=20000, help='operations per case')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case')
+    parser.add_argument('--filter', default=None, help='only run the cases containing this name')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the inputs')
+    parser.add_argument('--json', default=None, help='write the results to this JSON file')
+    parser.add_argument('--compare', default=None, help='compare to a baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown ratio')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = []
+    print(f'{"case":<40}{"grid":<24}{"zoom":>6}{"ops/s":>14}{"peak KiB":>12}')
+    for name, gridName, zoom, func in iterCases(args.number):
+        if args.filter and args.filter not in name:
+            continue
+        opsPerSecond, number, peakMemory = measure(func, args.repeat)
+        results.append({
+            'name': name,
+            'grid': gridName,
+            'zoom': zoom,
+            'number': number,
+            'opsPerSecond': opsPerSecond,
+            'peakMemoryBytes': peakMemory
+        })
+        zoomLabel = '' if zoom is None else zoom
+        print(
+            f'{name:<40}{gridName:<24}{zoomLabel:>6}'
+            f'{opsPerSecond:>14,.0f}{peakMemory / 1024:>12,.1f}'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'number': args.number,
+                'results': results
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
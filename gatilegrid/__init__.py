@@ -1,8 +1,33 @@
+from functools import lru_cache
+
+from .bitmap import TileCoverageBitmap
+from .expiry import TileExpiry
+from .expiry import expireTiles
 from .grid import Grid
+from .instrumentation import disableInstrumentation
+from .instrumentation import enableInstrumentation
+from .instrumentation import getInstrumentationSnapshot
+from .instrumentation import isInstrumentationEnabled
+from .instrumentation import resetInstrumentation
+from .partition import TileShard
+from .partition import planShards
+from .partition import runShards
+from .seeding import ChunkLease
+from .seeding import SeedingQueue
+from .swissgrids import swissGridOffset
+from .swissgrids import swissTileAlignment
+from .swissgrids import translateBounds
+from .swissgrids import translateExtentAddresses
+from .swissgrids import translateTileAddresses
 from .tilegrids import GeoadminTileGridLV03
 from .tilegrids import GeoadminTileGridLV95
 from .tilegrids import GlobalGeodeticTileGrid
 from .tilegrids import GlobalMercatorTileGrid
+from .tilelist import TileListReader
+from .tilelist import TileListWriter
+from .tilerangeset import TileRangeSet
+from .tiletypes import TileAddress
+from .tiletypes import TileBounds
 
 
 def getTileGrid(srs):
@@ -15,3 +40,68 @@ def getTileGrid(srs):
         return GlobalMercatorTileGrid
     elif srs == 4326:
         return GlobalGeodeticTileGrid
+
+
+# Maximum number of shared tile grid instances kept by getTileGridInstance
+TILE_GRID_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=TILE_GRID_CACHE_SIZE)
+def _getTileGridInstance(
+    srs, extent, tileSizePx, originCorner, tmsCompatible, useSwissExtent, useTileTypes
+):
+    kwargs = {
+        'extent': list(extent) if extent else None,
+        'tileSizePx': tileSizePx,
+        'originCorner': originCorner,
+        'useSwissExtent': useSwissExtent,
+        'useTileTypes': useTileTypes
+    }
+    if tmsCompatible is not None:
+        kwargs['tmsCompatible'] = tmsCompatible
+    return getTileGrid(srs)(**kwargs).freeze()
+
+
+def getTileGridInstance(
+    srs,
+    extent=None,
+    tileSizePx=256.0,
+    originCorner='top-left',
+    tmsCompatible=None,
+    useSwissExtent=True,
+    useTileTypes=False
+):
+    """
+    Return a shared tile grid instance with its zoom tables precomputed.
+    Instances are kept in a bounded LRU cache keyed by the parameters and
+    are frozen (see _TileGrid.freeze), assigning an attribute raises an
+    AttributeError.
+    Parameters:
+        srs -- 21781, 2056, 3857 or 4326
+        tmsCompatible (optional) -- only used by 4326, defaults to True
+        see the tile grid classes for the other parameters
+    """
+    assert srs in (21781, 2056, 3857, 4326), 'Unsupported tile grid'
+    if srs == 4326:
+        tmsCompatible = True if tmsCompatible is None else tmsCompatible
+    else:
+        assert tmsCompatible is None, 'tmsCompatible is only supported by 4326'
+    return _getTileGridInstance(
+        srs,
+        tuple(extent) if extent else None,
+        float(tileSizePx),
+        originCorner,
+        tmsCompatible,
+        useSwissExtent,
+        bool(useTileTypes)
+    )
+
+
+def getTileGridCacheInfo():
+    "Return the hits, misses, maxsize and currsize of the getTileGridInstance cache"
+    return _getTileGridInstance.cache_info()
+
+
+def clearTileGridCache():
+    "Empty the getTileGridInstance cache and reset its statistics"
+    _getTileGridInstance.cache_clear()
@@ -0,0 +1,13 @@
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def requireNumpy():
+    "Raise an ImportError if numpy, needed by the batch APIs, is missing"
+    if np is None:
+        raise ImportError(
+            'numpy is required for batch operations, '
+            'install it with `pip install gatilegrid[numpy]`'
+        )
@@ -0,0 +1,217 @@
+import hashlib
+import mmap
+import struct
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from ._compat import np
+from ._compat import requireNumpy
+
+ORIGIN_CORNERS = ('top-left', 'bottom-left')
+
+
+def _resolutionsDigest(tileGrid):
+    # Tells apart grids of the same srs with other resolutions (tmsCompatible)
+    resolutions = struct.pack(f'<{len(tileGrid.RESOLUTIONS)}d', *tileGrid.RESOLUTIONS)
+    return hashlib.sha1(resolutions).digest()[:8]
+
+
+class TileCoverageBitmap:
+    """
+    A bitmap of the tiles of a zoom level, one bit per tile of
+    getExtentAddress(zoom) indexed by (row, col). It lives in memory or in a
+    file mapped with mmap, so that several processes can share it without
+    copies. The file header records the grid parameters, a bitmap can only
+    be opened with the grid it was created with.
+    set and setTiles read, modify and write whole bytes, concurrent writers
+    of the same file (or instance) lose updates unless there is a single
+    writer or the writes are done within lock(). Readers need no lock.
+    Parameters:
+        tileGrid -- the tile grid instance
+        zoom -- the zoom level
+    """
+
+    MAGIC = b'GATB'
+    VERSION = 2
+    # magic, version, srs, zoom, originCorner, tileSizePx, extent address,
+    # digest of the resolutions
+    HEADER = struct.Struct('<4sHIHBxd4q8s')
+
+    def __init__(self, tileGrid, zoom, _buffer=None, _mmap=None, _file=None):
+        assert zoom in range(0, len(tileGrid.RESOLUTIONS))
+        self.tileGrid = tileGrid
+        self.zoom = zoom
+        [self.minRow, self.minCol, self.maxRow, self.maxCol] = \
+            tileGrid.zoomTable[zoom]['extentAddress']
+        self.nbCols = self.maxCol - self.minCol + 1
+        self.nbRows = self.maxRow - self.minRow + 1
+        self.nbBytes = self._nbBytes(tileGrid, zoom)
+        if _buffer is None:
+            _buffer = bytearray(self.nbBytes)
+        self._buffer = _buffer
+        self._mmap = _mmap
+        self._file = _file
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _nbBytes(tileGrid, zoom):
+        [minRow, minCol, maxRow, maxCol] = tileGrid.zoomTable[zoom]['extentAddress']
+        return ((maxCol - minCol + 1) * (maxRow - minRow + 1) + 7) // 8
+
+    @classmethod
+    def _header(cls, tileGrid, zoom):
+        [minRow, minCol, maxRow, maxCol] = tileGrid.zoomTable[zoom]['extentAddress']
+        return cls.HEADER.pack(
+            cls.MAGIC,
+            cls.VERSION,
+            tileGrid.spatialReference,
+            zoom,
+            ORIGIN_CORNERS.index(tileGrid.originCorner),
+            tileGrid.tileSizePx,
+            minRow,
+            minCol,
+            maxRow,
+            maxCol,
+            _resolutionsDigest(tileGrid)
+        )
+
+    @classmethod
+    def create(cls, path, tileGrid, zoom):
+        "Create an empty bitmap file and open it"
+        assert zoom in range(0, len(tileGrid.RESOLUTIONS))
+        with open(path, 'wb') as f:
+            f.write(cls._header(tileGrid, zoom))
+            f.truncate(cls.HEADER.size + cls._nbBytes(tileGrid, zoom))
+        return cls.open(path, tileGrid, zoom)
+
+    @classmethod
+    def open(cls, path, tileGrid, zoom, readonly=False):
+        "Map a bitmap file, the grid and the zoom must match the file header"
+        f = open(path, 'rb' if readonly else 'r+b')
+        mapped = None
+        try:
+            header = f.read(cls.HEADER.size)
+            assert header == cls._header(tileGrid, zoom), \
+                'Bitmap file does not match the tile grid'
+            access = mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE
+            mapped = mmap.mmap(f.fileno(), 0, access=access)
+            bitmap = cls(tileGrid, zoom, _mmap=mapped, _file=f)
+            assert len(mapped) == cls.HEADER.size + bitmap.nbBytes, 'Truncated bitmap file'
+        except Exception:
+            if mapped is not None:
+                mapped.close()
+            f.close()
+            raise
+        bitmap._buffer = memoryview(mapped)[cls.HEADER.size:]
+        return bitmap
+
+    def save(self, path):
+        "Write the bitmap to a file that can be mapped with open"
+        with open(path, 'wb') as f:
+            f.write(self._header(self.tileGrid, self.zoom))
+            f.write(self._buffer)
+
+    def flush(self):
+        "Flush the changes of a mapped bitmap to its file"
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self):
+        "Unmap the file of a mapped bitmap"
+        if self._mmap is not None:
+            self._buffer.release()
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+            self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @contextmanager
+    def lock(self):
+        """
+        Serialize the writes of several threads sharing this instance and,
+        for a mapped bitmap, of all the processes locking the same file
+        (with an exclusive flock where fcntl is available). Not reentrant.
+        """
+        with self._lock:
+            if self._file is None or fcntl is None:
+                yield self
+                return
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield self
+            finally:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _index(self, col, row):
+        assert self.minCol <= col <= self.maxCol and self.minRow <= row <= self.maxRow, \
+            'Tile address out of the grid extent'
+        return (row - self.minRow) * self.nbCols + (col - self.minCol)
+
+    def set(self, col, row, value=True):
+        "Set (or clear) the bit of a tile, not atomic (see lock)"
+        index = self._index(col, row)
+        if value:
+            self._buffer[index >> 3] |= 1 << (index & 7)
+        else:
+            self._buffer[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def test(self, col, row):
+        "Return True if the bit of a tile is set"
+        index = self._index(col, row)
+        return bool(self._buffer[index >> 3] & (1 << (index & 7)))
+
+    def __contains__(self, tileAddress):
+        "Test a [zoom, tileCol, tileRow] tile address"
+        [zoom, col, row] = tileAddress
+        return zoom == self.zoom and self.minCol <= col <= self.maxCol and \
+            self.minRow <= row <= self.maxRow and self.test(col, row)
+
+    def count(self):
+        "Return the number of tiles set"
+        nbSet = 0
+        chunkSize = 1 << 20
+        for start in range(0, self.nbBytes, chunkSize):
+            chunk = bytes(self._buffer[start:start + chunkSize])
+            nbSet += bin(int.from_bytes(chunk, 'little')).count('1')
+        return nbSet
+
+    def __len__(self):
+        return self.count()
+
+    def _indices(self, cols, rows):
+        requireNumpy()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        assert cols.shape == rows.shape
+        assert np.all((cols >= self.minCol) & (cols <= self.maxCol)), \
+            'Tile address out of the grid extent'
+        assert np.all((rows >= self.minRow) & (rows <= self.maxRow)), \
+            'Tile address out of the grid extent'
+        return (rows - self.minRow) * self.nbCols + (cols - self.minCol)
+
+    def setTiles(self, cols, rows, value=True):
+        "Vectorized set, not atomic (see lock)"
+        indices = self._indices(cols, rows)
+        data = np.frombuffer(self._buffer, dtype=np.uint8)
+        masks = (1 << (indices & 7)).astype(np.uint8)
+        if value:
+            np.bitwise_or.at(data, indices >> 3, masks)
+        else:
+            np.bitwise_and.at(data, indices >> 3, ~masks)
+
+    def testTiles(self, cols, rows):
+        "Vectorized test, returns a boolean array"
+        indices = self._indices(cols, rows)
+        data = np.frombuffer(self._buffer, dtype=np.uint8)
+        return (data[indices >> 3] & (1 << (indices & 7))) != 0
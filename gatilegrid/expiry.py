@@ -0,0 +1,91 @@
+from .tilerangeset import TileRangeSet
+
+
+class TileExpiry:
+    """
+    Collects the tiles to invalidate from a stream of changed extents over a
+    range of zoom levels, including the tiles touching an extent border.
+    Overlapping extents are merged per zoom level into TileRangeSet
+    instances, so the memory is bounded by the size of the ranges of the
+    result (plus a buffer of bufferSize extents) and not by the number of
+    extents.
+    Parameters:
+        tileGrid -- the tile grid instance
+        minZoom -- the first zoom level
+        maxZoom -- the last zoom level
+        bufferSize (optional) -- the number of extents merged at once
+    """
+
+    def __init__(self, tileGrid, minZoom, maxZoom, bufferSize=1024):
+        assert minZoom in range(0, len(tileGrid.RESOLUTIONS))
+        assert maxZoom in range(0, len(tileGrid.RESOLUTIONS))
+        assert minZoom <= maxZoom
+        assert bufferSize > 0
+        self.tileGrid = tileGrid
+        self.minZoom = minZoom
+        self.maxZoom = maxZoom
+        self.bufferSize = bufferSize
+        self._buffer = []
+        self._tileRangeSets = {
+            zoom: TileRangeSet(zoom) for zoom in range(minZoom, maxZoom + 1)
+        }
+
+    def add(self, extent):
+        "Add a changed extent [minX, minY, maxX, maxY]"
+        if not self.tileGrid.intersectsExtent(extent):
+            return
+        gridExtent = self.tileGrid.extent
+        self._buffer.append([
+            max(extent[0], gridExtent[0]),
+            max(extent[1], gridExtent[1]),
+            min(extent[2], gridExtent[2]),
+            min(extent[3], gridExtent[3])
+        ])
+        if len(self._buffer) >= self.bufferSize:
+            self._flush()
+
+    def update(self, extents):
+        "Add all the changed extents of an iterable"
+        for extent in extents:
+            self.add(extent)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        for zoom in range(self.minZoom, self.maxZoom + 1):
+            tileRangeSet = TileRangeSet.fromExtentAddresses(
+                zoom,
+                (self.tileGrid.getExtentAddress(zoom, extent=e) for e in self._buffer)
+            )
+            self._tileRangeSets[zoom] = self._tileRangeSets[zoom] | tileRangeSet
+        self._buffer = []
+
+    def getTileRangeSet(self, zoom):
+        "Return the TileRangeSet of the expired tiles at a given zoom level"
+        assert zoom in self._tileRangeSets
+        self._flush()
+        return self._tileRangeSets[zoom]
+
+    def iterTileRangeSets(self):
+        "Yields the zoom and the TileRangeSet of the expired tiles per zoom level"
+        self._flush()
+        for zoom in range(self.minZoom, self.maxZoom + 1):
+            yield (zoom, self._tileRangeSets[zoom])
+
+    def __iter__(self):
+        "Yields the deduplicated expired tile addresses, zoom level by zoom level"
+        for zoom, tileRangeSet in self.iterTileRangeSets():
+            yield from tileRangeSet
+
+    def __len__(self):
+        return sum(len(t) for z, t in self.iterTileRangeSets())
+
+
+def expireTiles(tileGrid, extents, minZoom, maxZoom):
+    """
+    Return the (zoom, TileRangeSet) of the tiles touching an iterable of
+    changed extents for each zoom level between minZoom and maxZoom
+    """
+    tileExpiry = TileExpiry(tileGrid, minZoom, maxZoom)
+    tileExpiry.update(extents)
+    return list(tileExpiry.iterTileRangeSets())
@@ -1,5 +1,9 @@
 import math
 
+from ._compat import np
+from ._compat import requireNumpy
+from .tiletypes import TileBounds
+
 
 class Grid:
     #   parameters:
@@ -23,8 +27,10 @@ class Grid:
     #   c_ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ d_|   #
     #   |_|_ _ _ _ _ _ _ _ _ _ _ _ _ _ _ |_|   #
 
-    def __init__(self, extent, resolutionX, resolutionY):
+    def __init__(self, extent, resolutionX, resolutionY, useTileTypes=False):
         self.extent = [float(e) for e in extent]
+        # Return TileBounds instead of lists for cell extents
+        self.useTileTypes = useTileTypes
         self.resolutionX = float(resolutionX)
         self.resolutionY = float(resolutionY)
         self._setOrigin()
@@ -36,6 +42,48 @@ class Grid:
                 cellExtent = self.cellExtent(col, row)
                 yield (cellExtent, col, row)
 
+    def iterBlocks(self, blockCols, blockRows, order='row-major'):
+        """
+        Yields windows of up to blockCols x blockRows cells as
+        (colOffset, rowOffset, nbCols, nbRows, windowExtent)
+        Parameters:
+            blockCols -- the number of cells over x of a window
+            blockRows -- the number of cells over y of a window
+            order (optional) -- 'row-major' (the default, GDAL blocks layout)
+                                or 'column-major' (same as __iter__)
+        """
+        assert blockCols > 0 and blockRows > 0
+        assert order in ('row-major', 'column-major')
+        colOffsets = range(0, self.nbCellsX, blockCols)
+        rowOffsets = range(0, self.nbCellsY, blockRows)
+        if order == 'row-major':
+            offsets = ((c, r) for r in rowOffsets for c in colOffsets)
+        else:
+            offsets = ((c, r) for c in colOffsets for r in rowOffsets)
+
+        for colOffset, rowOffset in offsets:
+            nbCols = min(blockCols, self.nbCellsX - colOffset)
+            nbRows = min(blockRows, self.nbCellsY - rowOffset)
+            if self.isLeft:
+                minX = self.MINX + (colOffset * self.resolutionX)
+                maxX = self.MINX + ((colOffset + nbCols) * self.resolutionX)
+            elif self.isRight:
+                minX = self.MAXX + ((colOffset + nbCols) * self.resolutionX)
+                maxX = self.MAXX + (colOffset * self.resolutionX)
+
+            if self.isBottom:
+                minY = self.MINY + (rowOffset * self.resolutionY)
+                maxY = self.MINY + ((rowOffset + nbRows) * self.resolutionY)
+            elif self.isTop:
+                minY = self.MAXY + ((rowOffset + nbRows) * self.resolutionY)
+                maxY = self.MAXY + (rowOffset * self.resolutionY)
+
+            if self.useTileTypes:
+                windowExtent = TileBounds(minX, minY, maxX, maxY)
+            else:
+                windowExtent = [minX, minY, maxX, maxY]
+            yield (colOffset, rowOffset, nbCols, nbRows, windowExtent)
+
     def cellExtent(self, col, row):
         if self.isLeft:
             minX = self.MINX + (col * self.resolutionX)
@@ -51,6 +99,8 @@ class Grid:
             minY = self.MAXY + ((row + 1) * self.resolutionY)
             maxY = self.MAXY + (row * self.resolutionY)
 
+        if self.useTileTypes:
+            return TileBounds(minX, minY, maxX, maxY)
         return [minX, minY, maxX, maxY]
 
     def cellAddressFromPointCoordinate(self, pointCoordinate):
@@ -77,6 +127,49 @@ class Grid:
             row = max(0, row - 1)
         return [int(math.floor(col)), int(math.floor(row))]
 
+    def cellAddressesFromPointCoordinates(self, xs, ys=None):
+        """
+        Vectorized cellAddressFromPointCoordinate. Returns the cols and rows
+        int arrays and a boolean mask of the points within the extent. The
+        cols and rows of the points outside the extent are set to -1.
+        Parameters:
+            xs -- the x coordinates or an (N, 2) array of [x, y] points
+            ys (optional) -- the y coordinates, required if xs only holds
+                             the x coordinates
+        """
+        requireNumpy()
+        if ys is None:
+            points = np.asarray(xs, dtype=np.float64).reshape(-1, 2)
+            xs = points[:, 0]
+            ys = points[:, 1]
+        else:
+            xs = np.asarray(xs, dtype=np.float64).ravel()
+            ys = np.asarray(ys, dtype=np.float64).ravel()
+        assert xs.shape == ys.shape
+
+        valid = (xs >= self.MINX) & (xs <= self.MAXX) & \
+            (ys >= self.MINY) & (ys <= self.MAXY)
+
+        if self.isLeft:
+            offsetX = xs - self.MINX
+        elif self.isRight:
+            offsetX = self.MAXX - xs
+
+        if self.isBottom:
+            offsetY = ys - self.MINY
+        elif self.isTop:
+            offsetY = self.MAXY - ys
+
+        cols = np.abs(offsetX / self.resolutionX)
+        rows = np.abs(offsetY / self.resolutionY)
+        onEdge = ((xs == self.MINX) | (xs == self.MAXX)) & (cols == np.floor(cols))
+        cols = np.where(onEdge, np.maximum(0, cols - 1), cols)
+        onEdge = ((ys == self.MINY) | (ys == self.MAXY)) & (rows == np.floor(rows))
+        rows = np.where(onEdge, np.maximum(0, rows - 1), rows)
+        cols = np.where(valid, np.floor(cols), -1).astype(np.int64)
+        rows = np.where(valid, np.floor(rows), -1).astype(np.int64)
+        return cols, rows, valid
+
     def getExtentAddress(self, extent):
         fromCellCoordinate = extent[:2]
         toCellCoordinate = extent[2:4]
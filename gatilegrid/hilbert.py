@@ -0,0 +1,63 @@
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def _generate(x, y, ax, ay, bx, by):
+    w = abs(ax + ay)
+    h = abs(bx + by)
+    dax, day = _sign(ax), _sign(ay)
+    dbx, dby = _sign(bx), _sign(by)
+
+    if h == 1:
+        for i in range(0, w):
+            yield (x, y)
+            x, y = x + dax, y + day
+        return
+    if w == 1:
+        for i in range(0, h):
+            yield (x, y)
+            x, y = x + dbx, y + dby
+        return
+
+    ax2, ay2 = ax // 2, ay // 2
+    bx2, by2 = bx // 2, by // 2
+    w2 = abs(ax2 + ay2)
+    h2 = abs(bx2 + by2)
+
+    if 2 * w > 3 * h:
+        # Long case: split in two along the major axis
+        if (w2 % 2) and (w > 2):
+            ax2, ay2 = ax2 + dax, ay2 + day
+        yield from _generate(x, y, ax2, ay2, bx, by)
+        yield from _generate(x + ax2, y + ay2, ax - ax2, ay - ay2, bx, by)
+    else:
+        # Standard case: one step up, one long horizontal, one step down
+        if (h2 % 2) and (h > 2):
+            bx2, by2 = bx2 + dbx, by2 + dby
+        yield from _generate(x, y, bx2, by2, ax2, ay2)
+        yield from _generate(x + bx2, y + by2, ax, ay, bx - bx2, by - by2)
+        yield from _generate(
+            x + (ax - dax) + (bx2 - dbx),
+            y + (ay - day) + (by2 - dby),
+            -bx2,
+            -by2,
+            -(ax - ax2),
+            -(ay - ay2)
+        )
+
+
+def iterHilbert(minCol, minRow, maxCol, maxRow):
+    """
+    Yields the (col, row) of an address range following a generalized
+    Hilbert curve (Jakub Cerveny's "gilbert" algorithm), which also covers
+    non square and non power of two ranges. Consecutive tiles are neighbours,
+    except for at most one diagonal step when both sides have an odd length.
+    """
+    width = maxCol - minCol + 1
+    height = maxRow - minRow + 1
+    if width >= height:
+        steps = _generate(0, 0, width, 0, 0, height)
+    else:
+        steps = _generate(0, 0, 0, height, width, 0)
+    for col, row in steps:
+        yield (minCol + col, minRow + row)
@@ -0,0 +1,193 @@
+import functools
+import inspect
+import threading
+import time
+
+from .grid import Grid
+from .tilegrids import _TileGrid
+
+# Instrumented methods, generators map to (zoomOf(item), tilesOf(item))
+_TILE_GRID_METHODS = (
+    'tileAddress',
+    'tileAddresses',
+    'tileBounds',
+    'tileBoundsArray',
+    'getExtentAddress',
+    'getPolygonAddressRanges',
+    'getParentTiles',
+    'getChildTiles',
+    'getParentTileRanges',
+    'getChildTileRanges',
+    'getClosestZoom',
+    'getCeilingZoom',
+    'numberOfTilesAtZoom',
+    'totalNumberOfTiles',
+)
+_TILE_GRID_GENERATORS = {
+    'iterGrid': (lambda item: item[1], lambda item: 1),
+    'iterPolygon': (lambda item: item[1], lambda item: 1),
+    'iterGridBlocks': (lambda item: item[1], lambda item: len(item[2])),
+}
+_GRID_METHODS = (
+    'cellExtent',
+    'cellAddressFromPointCoordinate',
+    'cellAddressesFromPointCoordinates',
+    'getExtentAddress',
+)
+_GRID_GENERATORS = {
+    '__iter__': (lambda item: None, lambda item: 1),
+    'iterBlocks': (lambda item: None, lambda item: item[2] * item[3]),
+}
+
+_lock = threading.Lock()
+_stats = {}
+_originals = {}
+_callback = None
+
+
+def _record(name, zoom, seconds, tiles, newCall=True):
+    with _lock:
+        methodStats = _stats.get(name)
+        if methodStats is None:
+            methodStats = _stats[name] = {'calls': 0, 'seconds': 0.0, 'tiles': 0, 'zooms': {}}
+        methodStats['calls'] += int(newCall)
+        methodStats['seconds'] += seconds
+        methodStats['tiles'] += tiles
+        if zoom is not None:
+            zoomStats = methodStats['zooms'].get(zoom)
+            if zoomStats is None:
+                zoomStats = methodStats['zooms'][zoom] = {'calls': 0, 'seconds': 0.0, 'tiles': 0}
+            zoomStats['calls'] += 1
+            zoomStats['seconds'] += seconds
+            zoomStats['tiles'] += tiles
+    callback = _callback
+    if callback is not None:
+        callback(name, zoom, seconds, tiles)
+
+
+def _zoomArgumentIndex(func):
+    parameters = list(inspect.signature(func).parameters)[1:]
+    return parameters.index('zoom') if 'zoom' in parameters else None
+
+
+def _wrapMethod(func):
+    zoomIndex = _zoomArgumentIndex(func)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            zoom = None
+            if zoomIndex is not None:
+                zoom = args[zoomIndex] if len(args) > zoomIndex else kwargs.get('zoom')
+            _record(f'{type(self).__name__}.{func.__name__}', zoom, seconds, 0)
+
+    return wrapper
+
+
+def _wrapGenerator(func, zoomOf, tilesOf):
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        generator = func(self, *args, **kwargs)
+        # Only the time spent in next() is measured, not the consumer time
+        perZoom = {}
+        zoom = None
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    perZoom.setdefault(zoom, [0.0, 0])[0] += time.perf_counter() - start
+                    return
+                seconds = time.perf_counter() - start
+                zoom = zoomOf(item)
+                zoomStats = perZoom.setdefault(zoom, [0.0, 0])
+                zoomStats[0] += seconds
+                zoomStats[1] += tilesOf(item)
+                yield item
+        finally:
+            generator.close()
+            name = f'{type(self).__name__}.{func.__name__}'
+            if not perZoom:
+                _record(name, None, 0.0, 0)
+            for i, (zoom, (seconds, tiles)) in enumerate(perZoom.items()):
+                _record(name, zoom, seconds, tiles, newCall=i == 0)
+
+    return wrapper
+
+
+def _patch(cls, methods, generators):
+    for name in methods:
+        original = cls.__dict__[name]
+        _originals[(cls, name)] = original
+        setattr(cls, name, _wrapMethod(original))
+    for name, (zoomOf, tilesOf) in generators.items():
+        original = cls.__dict__[name]
+        _originals[(cls, name)] = original
+        setattr(cls, name, _wrapGenerator(original, zoomOf, tilesOf))
+
+
+def enableInstrumentation(callback=None):
+    """
+    Start recording the call counts, the cumulative time and the number of
+    tiles yielded of the _TileGrid and Grid methods, per method and per zoom
+    level. The methods are wrapped only while the instrumentation is
+    enabled, disabled instrumentation costs nothing.
+    Times are inclusive: a method calling another instrumented method is
+    timed with it. Generators are only timed while producing items, a
+    call counts once for the method and once per zoom level it yielded
+    tiles for.
+    Parameters:
+        callback (optional) -- called with (name, zoom, seconds, tiles)
+        after each recorded call (per zoom level for generators), zoom is
+        None for methods without zoom
+    """
+    global _callback
+    _callback = callback
+    if _originals:
+        return
+    _patch(_TileGrid, _TILE_GRID_METHODS, _TILE_GRID_GENERATORS)
+    _patch(Grid, _GRID_METHODS, _GRID_GENERATORS)
+
+
+def disableInstrumentation():
+    "Restore the original methods, the recorded statistics are kept"
+    global _callback
+    _callback = None
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
+
+
+def isInstrumentationEnabled():
+    return len(_originals) > 0
+
+
+def getInstrumentationSnapshot():
+    """
+    Return a copy of the recorded statistics:
+    {'GeoadminTileGridLV95.tileAddress': {
+        'calls': ..., 'seconds': ..., 'tiles': ...,
+        'zooms': {zoom: {'calls': ..., 'seconds': ..., 'tiles': ...}}
+    }}
+    """
+    with _lock:
+        return {
+            name: dict(
+                methodStats,
+                zooms={z: dict(s) for z, s in methodStats['zooms'].items()}
+            )
+            for name, methodStats in _stats.items()
+        }
+
+
+def resetInstrumentation():
+    "Clear the recorded statistics"
+    with _lock:
+        _stats.clear()
+
@@ -0,0 +1,116 @@
+from ._compat import np
+from ._compat import requireNumpy
+
+# Keys are (zoom << ZOOM_SHIFT) | interleaved col and row bits
+ZOOM_SHIFT = 58
+MAX_COORD = 1 << (ZOOM_SHIFT // 2)
+
+
+def _part1by1(n):
+    "Spread the lower 32 bits of n over the even bits"
+    n = n & 0x00000000FFFFFFFF
+    n = (n | (n << 16)) & 0x0000FFFF0000FFFF
+    n = (n | (n << 8)) & 0x00FF00FF00FF00FF
+    n = (n | (n << 4)) & 0x0F0F0F0F0F0F0F0F
+    n = (n | (n << 2)) & 0x3333333333333333
+    n = (n | (n << 1)) & 0x5555555555555555
+    return n
+
+
+def _compact1by1(n):
+    "Gather the even bits of n, inverse of _part1by1"
+    n = n & 0x5555555555555555
+    n = (n | (n >> 1)) & 0x3333333333333333
+    n = (n | (n >> 2)) & 0x0F0F0F0F0F0F0F0F
+    n = (n | (n >> 4)) & 0x00FF00FF00FF00FF
+    n = (n | (n >> 8)) & 0x0000FFFF0000FFFF
+    n = (n | (n >> 16)) & 0x00000000FFFFFFFF
+    return n
+
+
+def interleave(col, row):
+    "Morton code of a col and a row, the col bits being the even bits"
+    return _part1by1(col) | (_part1by1(row) << 1)
+
+
+def deinterleave(code):
+    "Return the col and row of a Morton code"
+    return _compact1by1(code), _compact1by1(code >> 1)
+
+
+def encode(zoom, col, row):
+    "Return the Morton key of a tile"
+    assert 0 <= col < MAX_COORD and 0 <= row < MAX_COORD
+    return (zoom << ZOOM_SHIFT) | interleave(col, row)
+
+
+def decode(key):
+    "Return the [zoom, col, row] of a Morton key"
+    col, row = deinterleave(key & ((1 << ZOOM_SHIFT) - 1))
+    return [key >> ZOOM_SHIFT, col, row]
+
+
+def encodeArray(zoom, cols, rows):
+    "Vectorized encode, returns an uint64 array of keys"
+    requireNumpy()
+    cols = np.asarray(cols, dtype=np.uint64).ravel()
+    rows = np.asarray(rows, dtype=np.uint64).ravel()
+    assert cols.shape == rows.shape
+    assert np.all(cols < MAX_COORD) and np.all(rows < MAX_COORD)
+    zooms = np.broadcast_to(np.asarray(zoom, dtype=np.uint64), cols.shape)
+    return (zooms << np.uint64(ZOOM_SHIFT)) | _part1by1(cols) | (_part1by1(rows) << np.uint64(1))
+
+
+def decodeArray(keys):
+    "Vectorized decode, returns the zooms, cols and rows int64 arrays"
+    requireNumpy()
+    keys = np.asarray(keys, dtype=np.uint64).ravel()
+    codes = keys & np.uint64((1 << ZOOM_SHIFT) - 1)
+    zooms = (keys >> np.uint64(ZOOM_SHIFT)).astype(np.int64)
+    cols = _compact1by1(codes).astype(np.int64)
+    rows = _compact1by1(codes >> np.uint64(1)).astype(np.int64)
+    return zooms, cols, rows
+
+
+def toQuadKey(zoom, col, row):
+    "Return the quadkey string of a tile, one digit per zoom level"
+    assert 0 <= col < 2**zoom and 0 <= row < 2**zoom
+    digits = []
+    for i in range(zoom, 0, -1):
+        mask = 1 << (i - 1)
+        digits.append(str((1 if col & mask else 0) + (2 if row & mask else 0)))
+    return ''.join(digits)
+
+
+def fromQuadKey(quadKey):
+    "Return the [zoom, col, row] of a quadkey string"
+    col = row = 0
+    for digit in quadKey:
+        digit = int(digit)
+        assert digit in range(0, 4)
+        col = (col << 1) | (digit & 1)
+        row = (row << 1) | (digit >> 1)
+    return [len(quadKey), col, row]
+
+
+def iterZOrder(minCol, minRow, maxCol, maxRow):
+    "Yields the (col, row) of an address range in Z-order"
+    size = 1
+    while size <= max(maxCol, maxRow):
+        size <<= 1
+    stack = [(0, 0, size)]
+    while stack:
+        c0, r0, size = stack.pop()
+        if c0 > maxCol or r0 > maxRow or c0 + size <= minCol or r0 + size <= minRow:
+            continue
+        if c0 >= minCol and r0 >= minRow and c0 + size - 1 <= maxCol and \
+                r0 + size - 1 <= maxRow:
+            for code in range(0, size * size):
+                col, row = deinterleave(code)
+                yield (c0 + col, r0 + row)
+            continue
+        half = size >> 1
+        stack.append((c0 + half, r0 + half, half))
+        stack.append((c0, r0 + half, half))
+        stack.append((c0 + half, r0, half))
+        stack.append((c0, r0, half))
@@ -0,0 +1,107 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+
+class TileShard(namedtuple('TileShard', ['index', 'rectangles'])):
+    """
+    A contiguous part of iterGrid(minZoom, maxZoom) described by rectangles
+    (zoom, minRow, minCol, maxRow, maxCol) in iterGrid order, at most 3 per
+    zoom level. Small, immutable and picklable.
+    """
+    __slots__ = ()
+
+    @property
+    def nbTiles(self):
+        return sum(
+            (maxRow - minRow + 1) * (maxCol - minCol + 1)
+            for (zoom, minRow, minCol, maxRow, maxCol) in self.rectangles
+        )
+
+    def iterTiles(self, tileGrid):
+        "Yields the tileBounds, zoom, tileCol and tileRow of the shard like iterGrid"
+        for (zoom, minRow, minCol, maxRow, maxCol) in self.rectangles:
+            for row in range(minRow, maxRow + 1):
+                for col in range(minCol, maxCol + 1):
+                    tileBounds = tileGrid.tileBoundsUnchecked(zoom, col, row)
+                    yield (tileBounds, zoom, col, row)
+
+
+def _rectangles(zoomStats, zoom, first, last):
+    # The rectangles of the [first, last] row-major indices of a zoom level
+    [minRow, minCol, maxRow, maxCol] = zoomStats['extentAddress']
+    nbTilesX = zoomStats['nbTilesX']
+    firstRow, firstCol = divmod(first, nbTilesX)
+    lastRow, lastCol = divmod(last, nbTilesX)
+    if firstRow == lastRow:
+        return [(zoom, minRow + firstRow, minCol + firstCol, minRow + lastRow, minCol + lastCol)]
+    rectangles = []
+    if firstCol > 0:
+        rectangles.append((zoom, minRow + firstRow, minCol + firstCol, minRow + firstRow, maxCol))
+        firstRow += 1
+    tail = []
+    if lastCol < nbTilesX - 1:
+        tail.append((zoom, minRow + lastRow, minCol, minRow + lastRow, minCol + lastCol))
+        lastRow -= 1
+    if firstRow <= lastRow:
+        rectangles.append((zoom, minRow + firstRow, minCol, minRow + lastRow, maxCol))
+    return rectangles + tail
+
+
+def planShards(tileGrid, minZoom, maxZoom, nbWorkers, shardsPerWorker=1):
+    """
+    Split iterGrid(minZoom, maxZoom) into nbWorkers * shardsPerWorker
+    contiguous TileShard whose number of tiles differ by at most one. The shards follow each
+    other in the iterGrid order and may span several zoom levels.
+    Parameters:
+        tileGrid -- the tile grid instance
+        minZoom -- the first zoom level
+        maxZoom -- the last zoom level
+        nbWorkers -- the number of workers
+        shardsPerWorker (optional) -- more shards per worker even out
+                                      the differences of rendering costs
+    """
+    assert minZoom in range(0, len(tileGrid.RESOLUTIONS))
+    assert maxZoom in range(0, len(tileGrid.RESOLUTIONS))
+    assert minZoom <= maxZoom
+    assert nbWorkers > 0 and shardsPerWorker > 0
+    nbShards = nbWorkers * shardsPerWorker
+    nbTiles = sum(tileGrid.zoomTable[z]['nbTiles'] for z in range(minZoom, maxZoom + 1))
+    bounds = [i * nbTiles // nbShards for i in range(0, nbShards + 1)]
+
+    shards = []
+    zoom = minZoom
+    offset = 0
+    for index in range(0, nbShards):
+        start, stop = bounds[index], bounds[index + 1]
+        rectangles = []
+        while start < stop:
+            zoomStats = tileGrid.zoomTable[zoom]
+            last = min(stop, offset + zoomStats['nbTiles']) - 1
+            rectangles.extend(_rectangles(zoomStats, zoom, start - offset, last - offset))
+            start = last + 1
+            if start == offset + zoomStats['nbTiles']:
+                offset += zoomStats['nbTiles']
+                zoom += 1
+        shards.append(TileShard(index, tuple(rectangles)))
+    return shards
+
+
+def runShards(func, shards, maxWorkers=None, ordered=False):
+    """
+    Call func(shard) for each shard in a ProcessPoolExecutor and yield the
+    (shard, result) pairs as they complete (or in the shards order if
+    ordered is True). func must be picklable (a module level function),
+    getTileGridInstance provides a grid per worker process. If the consumer
+    stops early, the shards not started yet are cancelled.
+    """
+    executor = ProcessPoolExecutor(max_workers=maxWorkers)
+    try:
+        if ordered:
+            yield from zip(shards, executor.map(func, shards))
+            return
+        futures = {executor.submit(func, shard): shard for shard in shards}
+        for future in as_completed(futures):
+            yield (futures[future], future.result())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,119 @@
+import math
+
+# Tolerance (in tiles) under which coordinates are snapped to the tile borders
+SNAP_TOLERANCE = 1e-9
+
+
+def _snap(value):
+    "Snap a tile space coordinate to the closest tile border if within tolerance"
+    rounded = round(value)
+    if abs(value - rounded) < SNAP_TOLERANCE:
+        return float(rounded)
+    return value
+
+
+def polygonRings(polygon):
+    """
+    Return the list of rings of a ring, a polygon (list of rings, the first
+    one being the exterior) or a multipolygon (list of polygons). Rings are
+    lists of [x, y] and don't need to be closed.
+    """
+    depth = 0
+    item = polygon
+    while isinstance(item, (list, tuple)) and len(item) and \
+            isinstance(item[0], (list, tuple)):
+        item = item[0]
+        depth += 1
+    assert depth in (1, 2, 3), 'Unsupported polygon format'
+    if depth == 1:
+        return [polygon]
+    if depth == 2:
+        return list(polygon)
+    return [ring for p in polygon for ring in p]
+
+
+def _ringEdges(ring):
+    "Yields the non degenerated edges of a ring as (u0, v0, u1, v1)"
+    nbPoints = len(ring)
+    for i in range(0, nbPoints):
+        u0, v0 = _snap(ring[i][0]), _snap(ring[i][1])
+        u1, v1 = _snap(ring[(i + 1) % nbPoints][0]), _snap(ring[(i + 1) % nbPoints][1])
+        if u0 != u1 or v0 != v1:
+            yield (u0, v0, u1, v1)
+
+
+def _mergeIntervals(intervals):
+    "Merge overlapping and adjacent [minCol, maxCol] intervals"
+    intervals.sort()
+    merged = [list(intervals[0])]
+    for c0, c1 in intervals[1:]:
+        if c0 <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], c1)
+        else:
+            merged.append([c0, c1])
+    return merged
+
+
+def rasterizeRings(rings, minRow, maxRow, minCol, maxCol):
+    """
+    Scanline rasterization of rings expressed in tile space, where the tile
+    (col, row) covers [col, col + 1] x [row, row + 1]. Returns a list of
+    [row, minCol, maxCol] ranges of the tiles whose interior intersects the
+    interior of the rings (even-odd rule), snapping coordinates closer than
+    SNAP_TOLERANCE to a tile border onto that border, clipped to the given address
+    range and sorted by row then col.
+    A tile intersects the polygon if an edge crosses it or if it lies
+    within the polygon, in which case its center is within the polygon.
+    """
+    edges = [e for ring in rings for e in _ringEdges(ring)]
+    if not edges:
+        return []
+    rowIntervals = {}
+
+    # Tiles crossed by an edge
+    for (u0, v0, u1, v1) in edges:
+        vMin, vMax = min(v0, v1), max(v0, v1)
+        rowFrom = max(int(math.floor(vMin)), minRow)
+        rowTo = min(int(math.ceil(vMax)) - 1, maxRow)
+        for row in range(rowFrom, rowTo + 1):
+            if v0 == v1:
+                a, b = min(u0, u1), max(u0, u1)
+            else:
+                vA, vB = max(vMin, row), min(vMax, row + 1)
+                uA = u0 + (u1 - u0) * (vA - v0) / (v1 - v0)
+                uB = u0 + (u1 - u0) * (vB - v0) / (v1 - v0)
+                a, b = _snap(min(uA, uB)), _snap(max(uA, uB))
+            colFrom = max(int(math.floor(a)), minCol)
+            colTo = min(int(math.ceil(b)) - 1, maxCol)
+            if colFrom <= colTo:
+                rowIntervals.setdefault(row, []).append((colFrom, colTo))
+
+    # Tiles within the polygon, using an active edge table on the tile centers
+    edges = sorted((e for e in edges if e[1] != e[3]), key=lambda e: min(e[1], e[3]))
+    active = []
+    nextEdge = 0
+    rowFrom = minRow
+    if edges:
+        rowFrom = max(int(math.floor(min(edges[0][1], edges[0][3]))), minRow)
+    for row in range(rowFrom, maxRow + 1):
+        v = row + 0.5
+        while nextEdge < len(edges) and min(edges[nextEdge][1], edges[nextEdge][3]) <= v:
+            active.append(edges[nextEdge])
+            nextEdge += 1
+        active = [e for e in active if max(e[1], e[3]) > v]
+        if not active:
+            if nextEdge == len(edges):
+                break
+            continue
+        crossings = sorted(u0 + (u1 - u0) * (v - v0) / (v1 - v0) for (u0, v0, u1, v1) in active)
+        for i in range(0, len(crossings) - 1, 2):
+            colFrom = max(int(math.ceil(crossings[i] - 0.5)), minCol)
+            colTo = min(int(math.floor(crossings[i + 1] - 0.5)), maxCol)
+            if colFrom <= colTo:
+                rowIntervals.setdefault(row, []).append((colFrom, colTo))
+
+    ranges = []
+    for row in sorted(rowIntervals):
+        for c0, c1 in _mergeIntervals(rowIntervals[row]):
+            ranges.append([row, c0, c1])
+    return ranges
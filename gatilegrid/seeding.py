@@ -0,0 +1,227 @@
+import json
+import math
+import os
+import socket
+import time
+import uuid
+from collections import namedtuple
+
+from .partition import planShards
+
+
+class ChunkLease(namedtuple('ChunkLease', ['shard', 'owner', 'token', 'expires'])):
+    "A chunk (TileShard) leased by an owner until the expires timestamp"
+    __slots__ = ()
+
+
+class SeedingQueue:
+    """
+    A resumable work queue over iterGrid(minZoom, maxZoom) shared by several
+    processes or nodes through a directory. The tiles are cut into chunks
+    (TileShard) of about chunkSize tiles, handed out with lease files and
+    marked as done once completed, so that a restarted run only seeds the
+    unfinished chunks. Leases not renewed before leaseTimeout seconds
+    expire and are reclaimed by the other workers, at worst a chunk is
+    seeded twice.
+    Parameters:
+        tileGrid -- the tile grid instance
+        minZoom -- the first zoom level
+        maxZoom -- the last zoom level
+        directory -- the shared directory, created if needed
+        chunkSize (optional) -- the number of tiles per chunk
+        leaseTimeout (optional) -- the lease duration in seconds
+        owner (optional) -- the worker name, defaults to host:pid
+    """
+
+    def __init__(
+        self,
+        tileGrid,
+        minZoom,
+        maxZoom,
+        directory,
+        chunkSize=65536,
+        leaseTimeout=600.0,
+        owner=None
+    ):
+        assert minZoom in range(0, len(tileGrid.RESOLUTIONS))
+        assert maxZoom in range(0, len(tileGrid.RESOLUTIONS))
+        assert minZoom <= maxZoom
+        assert chunkSize > 0
+        self.tileGrid = tileGrid
+        self.minZoom = minZoom
+        self.maxZoom = maxZoom
+        self.directory = directory
+        self.leaseTimeout = leaseTimeout
+        self.owner = owner or f'{socket.gethostname()}:{os.getpid()}'
+        nbTiles = sum(tileGrid.zoomTable[z]['nbTiles'] for z in range(minZoom, maxZoom + 1))
+        self.nbChunks = int(math.ceil(nbTiles / float(chunkSize)))
+        self.chunks = planShards(tileGrid, minZoom, maxZoom, self.nbChunks)
+        self._leasesDir = os.path.join(directory, 'leases')
+        self._doneDir = os.path.join(directory, 'done')
+        # Done markers are never removed: the chunks known to be done and the
+        # number of leading chunks all done are not probed again
+        self._knownDone = set()
+        self._nbLeadingDone = 0
+        os.makedirs(self._leasesDir, exist_ok=True)
+        os.makedirs(self._doneDir, exist_ok=True)
+        self._checkManifest()
+
+    def _checkManifest(self):
+        manifest = {
+            'srs': self.tileGrid.spatialReference,
+            'extent': list(self.tileGrid.extent),
+            'tileSizePx': self.tileGrid.tileSizePx,
+            'originCorner': self.tileGrid.originCorner,
+            'minZoom': self.minZoom,
+            'maxZoom': self.maxZoom,
+            'nbChunks': self.nbChunks
+        }
+        path = os.path.join(self.directory, 'manifest.json')
+        if not self._createFile(path, manifest):
+            with open(path) as f:
+                assert json.load(f) == manifest, 'Seeding queue directory of another tile range'
+
+    def _writeTemp(self, path, content):
+        tempPath = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(tempPath, 'w') as f:
+            json.dump(content, f)
+        return tempPath
+
+    def _createFile(self, path, content):
+        # Atomic creation with content, fails if path exists
+        tempPath = self._writeTemp(path, content)
+        try:
+            os.link(tempPath, path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.unlink(tempPath)
+
+    def _leasePath(self, index):
+        return os.path.join(self._leasesDir, f'{index}.json')
+
+    def _donePath(self, index):
+        return os.path.join(self._doneDir, f'{index}.json')
+
+    def _readLease(self, index):
+        try:
+            with open(self._leasePath(index)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _reclaim(self, index, lease):
+        # Only one worker moves the expired lease away, a fresh lease moved
+        # by mistake (it replaced the expired one meanwhile) is put back
+        path = self._leasePath(index)
+        tombstonePath = f'{path}.{uuid.uuid4().hex}.expired'
+        try:
+            os.rename(path, tombstonePath)
+        except FileNotFoundError:
+            return
+        try:
+            with open(tombstonePath) as f:
+                moved = json.load(f)
+            if moved['token'] != lease['token']:
+                try:
+                    os.link(tombstonePath, path)
+                except FileExistsError:
+                    pass
+        finally:
+            os.unlink(tombstonePath)
+
+    def isDone(self, index):
+        if index in self._knownDone:
+            return True
+        if os.path.exists(self._donePath(index)):
+            self._knownDone.add(index)
+            return True
+        return False
+
+    def acquire(self):
+        "Lease the first available chunk, returns a ChunkLease or None"
+        while self._nbLeadingDone < self.nbChunks and self.isDone(self._nbLeadingDone):
+            self._nbLeadingDone += 1
+        for shard in self.chunks[self._nbLeadingDone:]:
+            if self.isDone(shard.index):
+                continue
+            lease = self._readLease(shard.index)
+            if lease is not None:
+                if lease['expires'] >= time.time():
+                    continue
+                self._reclaim(shard.index, lease)
+            expires = time.time() + self.leaseTimeout
+            content = {'owner': self.owner, 'token': uuid.uuid4().hex, 'expires': expires}
+            if self._createFile(self._leasePath(shard.index), content):
+                # Completed by another worker between the checks
+                if self.isDone(shard.index):
+                    os.unlink(self._leasePath(shard.index))
+                    continue
+                return ChunkLease(shard, self.owner, content['token'], expires)
+        return None
+
+    def ownsLease(self, lease):
+        current = self._readLease(lease.shard.index)
+        return current is not None and current['token'] == lease.token
+
+    def renew(self, lease):
+        "Extend a lease by leaseTimeout seconds, returns None if it was lost"
+        if not self.ownsLease(lease):
+            return None
+        expires = time.time() + self.leaseTimeout
+        path = self._leasePath(lease.shard.index)
+        content = {'owner': lease.owner, 'token': lease.token, 'expires': expires}
+        os.replace(self._writeTemp(path, content), path)
+        return lease._replace(expires=expires)
+
+    def complete(self, lease):
+        "Mark the chunk of a lease as done and release the lease"
+        path = self._donePath(lease.shard.index)
+        content = {'owner': lease.owner, 'nbTiles': lease.shard.nbTiles, 'time': time.time()}
+        os.replace(self._writeTemp(path, content), path)
+        self._knownDone.add(lease.shard.index)
+        self.release(lease)
+
+    def release(self, lease):
+        "Give a lease back without completing its chunk"
+        if self.ownsLease(lease):
+            try:
+                os.unlink(self._leasePath(lease.shard.index))
+            except FileNotFoundError:
+                pass
+
+    def __iter__(self):
+        "Yields the ChunkLease of the available chunks until none is left"
+        while True:
+            lease = self.acquire()
+            if lease is None:
+                return
+            yield lease
+
+    def progress(self):
+        "Return the chunk and tile counts of the queue"
+        now = time.time()
+        progress = {
+            'nbChunks': self.nbChunks,
+            'nbDone': 0,
+            'nbLeased': 0,
+            'nbExpired': 0,
+            'nbPending': 0,
+            'nbTiles': 0,
+            'nbTilesDone': 0
+        }
+        for shard in self.chunks:
+            progress['nbTiles'] += shard.nbTiles
+            if self.isDone(shard.index):
+                progress['nbDone'] += 1
+                progress['nbTilesDone'] += shard.nbTiles
+                continue
+            lease = self._readLease(shard.index)
+            if lease is None:
+                progress['nbPending'] += 1
+            elif lease['expires'] < now:
+                progress['nbExpired'] += 1
+            else:
+                progress['nbLeased'] += 1
+        return progress
@@ -0,0 +1,133 @@
+from ._compat import np
+from ._compat import requireNumpy
+from .scanline import SNAP_TOLERANCE
+
+# LV95 coordinates minus LV03 coordinates
+LV95_OFFSET = (2000000.0, 1000000.0)
+
+
+def swissGridOffset(fromGrid, toGrid):
+    "Return the (dx, dy) from the coordinates of fromGrid to the ones of toGrid"
+    srs = (fromGrid.spatialReference, toGrid.spatialReference)
+    assert srs in ((21781, 2056), (2056, 21781)), 'Expected an LV03 and an LV95 tile grid'
+    if srs == (21781, 2056):
+        return LV95_OFFSET
+    return (-LV95_OFFSET[0], -LV95_OFFSET[1])
+
+
+def _axes(fromGrid, toGrid, zoom):
+    # For each axis (x, y) the target tile coordinate of a source tile
+    # coordinate u is t = a + b * u, returns the (a, b) of both axes
+    assert zoom in range(0, len(fromGrid.RESOLUTIONS))
+    assert zoom in range(0, len(toGrid.RESOLUTIONS))
+    [dx, dy] = swissGridOffset(fromGrid, toGrid)
+    fromTileSize = fromGrid.tileSize(zoom)
+    toTileSize = toGrid.tileSize(zoom)
+    ratio = fromTileSize / toTileSize
+    axes = [((fromGrid.MINX + dx - toGrid.MINX) / toTileSize, ratio)]
+    # Tile rows grow downwards from MAXY or upwards from MINY
+    fromSign, fromBase = (-1, fromGrid.MAXY) if fromGrid.originCorner == 'top-left' \
+        else (1, fromGrid.MINY)
+    toSign, toBase = (-1, toGrid.MAXY) if toGrid.originCorner == 'top-left' \
+        else (1, toGrid.MINY)
+    axes.append((toSign * (fromBase + dy - toBase) / toTileSize, toSign * fromSign * ratio))
+    return axes
+
+
+def _isInteger(value):
+    return abs(value - round(value)) < SNAP_TOLERANCE
+
+
+def swissTileAlignment(fromGrid, toGrid, zoom):
+    """
+    Return the ((colShift, 1), (rowShift, rowSign)) integer mapping of the
+    tiles of fromGrid onto the tiles of toGrid at a zoom level if they
+    align one to one, else None. A tile (col, row) maps to (col + colShift,
+    row + rowShift) if rowSign is 1 and to (col + colShift, rowShift - 1 - row)
+    if the origin corners differ (rowSign is -1).
+    The default LV03 and LV95 grids always align as their extents differ
+    by the offset of 2,000,000 / 1,000,000.
+    """
+    alignment = []
+    for (a, b) in _axes(fromGrid, toGrid, zoom):
+        if abs(abs(b) - 1.0) >= SNAP_TOLERANCE or not _isInteger(a):
+            return None
+        alignment.append((int(round(a)), 1 if b > 0 else -1))
+    return tuple(alignment)
+
+
+def _mapAxis(starts, stops, a, b, aligned):
+    # Map the source tiles [start, stop] of an axis to the target tiles
+    if aligned:
+        if b == 1:
+            return starts + a, stops + a
+        return a - 1 - stops, a - 1 - starts
+    t0 = a + b * starts
+    t1 = a + b * (stops + 1)
+    lo = np.minimum(t0, t1)
+    hi = np.maximum(t0, t1)
+    # Snap onto the tile borders within tolerance
+    lo = np.where(np.abs(lo - np.round(lo)) < SNAP_TOLERANCE, np.round(lo), lo)
+    hi = np.where(np.abs(hi - np.round(hi)) < SNAP_TOLERANCE, np.round(hi), hi)
+    minTiles = np.floor(lo).astype(np.int64)
+    maxTiles = np.maximum(np.ceil(hi).astype(np.int64) - 1, minTiles)
+    return minTiles, maxTiles
+
+
+def translateExtentAddresses(fromGrid, toGrid, zoom, extentAddresses):
+    """
+    Translate [minRow, minCol, maxRow, maxCol] address ranges of fromGrid
+    to the address ranges of toGrid covering them at the same zoom level.
+    Aligned grids are mapped with integers only, otherwise (different
+    origin corners or tile sizes) the ranges of the target tiles touching
+    the source ranges are returned. The result is not clipped to the
+    target grid extent.
+    Parameters:
+        fromGrid -- the LV03 (or LV95) tile grid instance
+        toGrid -- the LV95 (or LV03) tile grid instance
+        zoom -- the zoom level
+        extentAddresses -- an (N, 4) array like of address ranges
+    Returns an (N, 4) int64 array of address ranges
+    """
+    requireNumpy()
+    extentAddresses = np.asarray(extentAddresses, dtype=np.int64).reshape(-1, 4)
+    alignment = swissTileAlignment(fromGrid, toGrid, zoom)
+    aligned = alignment is not None
+    [(aX, bX), (aY, bY)] = alignment if aligned else _axes(fromGrid, toGrid, zoom)
+    ranges = np.empty(extentAddresses.shape, dtype=np.int64)
+    ranges[:, 1], ranges[:, 3] = _mapAxis(
+        extentAddresses[:, 1], extentAddresses[:, 3], aX, bX, aligned
+    )
+    ranges[:, 0], ranges[:, 2] = _mapAxis(
+        extentAddresses[:, 0], extentAddresses[:, 2], aY, bY, aligned
+    )
+    return ranges
+
+
+def translateTileAddresses(fromGrid, toGrid, zoom, cols, rows):
+    """
+    Translate tile addresses of fromGrid to toGrid at the same zoom level.
+    Returns an (N, 4) int64 array of the [minRow, minCol, maxRow, maxCol]
+    address ranges of toGrid covering each tile, a single tile
+    (minRow == maxRow and minCol == maxCol) when swissTileAlignment is
+    not None.
+    """
+    requireNumpy()
+    cols = np.asarray(cols, dtype=np.int64).ravel()
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    assert cols.shape == rows.shape
+    return translateExtentAddresses(
+        fromGrid, toGrid, zoom, np.stack([rows, cols, rows, cols], axis=1)
+    )
+
+
+def translateBounds(fromGrid, toGrid, bounds):
+    """
+    Translate [minX, minY, maxX, maxY] bounds or extents from the
+    coordinates of fromGrid to the ones of toGrid.
+    Returns an (N, 4) float64 array.
+    """
+    requireNumpy()
+    bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+    [dx, dy] = swissGridOffset(fromGrid, toGrid)
+    return bounds + np.array([dx, dy, dx, dy])
@@ -1,9 +1,29 @@
+import asyncio
+import itertools
 import math
+from fractions import Fraction
+from types import MappingProxyType
+
+from . import morton
+from ._compat import np
+from ._compat import requireNumpy
+from .hilbert import iterHilbert
+from .scanline import polygonRings
+from .scanline import rasterizeRings
+from .tiletypes import TileAddress
+from .tiletypes import TileBounds
 
 EPSG4326_METERS_PER_UNIT = math.pi * 6378137 / 180
 # Standard rendered pixel size as defined by OGC standards
 STANDARD_PIXEL_SIZE = 0.00028
 
+# The attributes the cached tables of _TileGrid are derived from, assigning
+# one of them drops the caches
+_CACHE_SOURCES = ('extent', 'originCorner', 'tileSizePx', 'RESOLUTIONS')
+_CACHES = (
+    '_zoomTable', '_zoomRatios', '_sortedResolutions', '_sortedScales', '_isRegular'
+)
+
 
 class _ResolutionsBase:
     # Defines zooms 0 to 27
@@ -172,10 +192,13 @@ class _TileGrid(object):
         tileSizePx=256.0,
         originCorner='top-left',
         tmsCompatible=None,
-        useSwissExtent=True
+        useSwissExtent=True,
+        useTileTypes=False
     ):
         assert originCorner in ('bottom-left', 'top-left')
         self.originCorner = originCorner
+        # Return TileBounds and TileAddress instead of lists
+        self.useTileTypes = useTileTypes
 
         if hasattr(self, 'resolutions') and tmsCompatible is not None:
             self.resolutions(tmsCompatible, tileSizePx)
@@ -199,18 +222,24 @@ class _TileGrid(object):
         self.tileSizePx = tileSizePx  # In pixels
         self.XSPAN = self.MAXX - self.MINX
         self.YSPAN = self.MAXY - self.MINY
+        # Validated once here, used by the unchecked methods
+        self._tileSizes = [self.tileSizePx * res for res in self.RESOLUTIONS]
 
     def tileSize(self, zoom):
         "Returns the size (in meters) of a tile"
         assert zoom in range(0, len(self.RESOLUTIONS))
-        return self.tileSizePx * self.RESOLUTIONS[int(zoom)]
+        return self._tileSizes[int(zoom)]
+
+    def tileSizeUnchecked(self, zoom):
+        "Same as tileSize without validation, zoom must be a valid int"
+        return self._tileSizes[zoom]
 
     def tileBounds(self, zoom, tileCol, tileRow):
         "Returns the bounds of a tile in LV03 (EPSG:21781)"
         assert zoom in range(0, len(self.RESOLUTIONS))
 
         # 0,0 at top left: y axis down and x axis right
-        tileSize = self.tileSize(zoom)
+        tileSize = self._tileSizes[int(zoom)]
         minX = self.MINX + tileCol * tileSize
         maxX = self.MINX + (tileCol + 1) * tileSize
         if self.originCorner == 'bottom-left':
@@ -219,8 +248,52 @@ class _TileGrid(object):
         elif self.originCorner == 'top-left':
             minY = self.MAXY - (tileRow + 1) * tileSize
             maxY = self.MAXY - tileRow * tileSize
+        if self.useTileTypes:
+            return TileBounds(minX, minY, maxX, maxY)
         return [minX, minY, maxX, maxY]
 
+    def tileBoundsUnchecked(self, zoom, tileCol, tileRow):
+        "Same as tileBounds without validation, zoom must be a valid int"
+        tileSize = self._tileSizes[zoom]
+        minX = self.MINX + tileCol * tileSize
+        maxX = self.MINX + (tileCol + 1) * tileSize
+        if self.originCorner == 'top-left':
+            minY = self.MAXY - (tileRow + 1) * tileSize
+            maxY = self.MAXY - tileRow * tileSize
+        else:
+            minY = self.MINY + tileRow * tileSize
+            maxY = self.MINY + (tileRow + 1) * tileSize
+        if self.useTileTypes:
+            return TileBounds(minX, minY, maxX, maxY)
+        return [minX, minY, maxX, maxY]
+
+    def tileBoundsArray(self, zoom, cols, rows):
+        """
+        Return the bounds of many tiles at once as a contiguous (N, 4) float64
+        array of [minX, minY, maxX, maxY]. Same values as tileBounds.
+        Parameters:
+            zoom -- the zoom level
+            cols -- the tile columns
+            rows -- the tile rows
+        """
+        requireNumpy()
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        assert cols.shape == rows.shape
+
+        tileSize = self.tileSize(zoom)
+        bounds = np.empty((cols.shape[0], 4), dtype=np.float64)
+        bounds[:, 0] = self.MINX + cols * tileSize
+        bounds[:, 2] = self.MINX + (cols + 1) * tileSize
+        if self.originCorner == 'bottom-left':
+            bounds[:, 1] = self.MINY + rows * tileSize
+            bounds[:, 3] = self.MINY + (rows + 1) * tileSize
+        elif self.originCorner == 'top-left':
+            bounds[:, 1] = self.MAXY - (rows + 1) * tileSize
+            bounds[:, 3] = self.MAXY - rows * tileSize
+        return bounds
+
     def tileAddress(self, zoom, point):
         "Returns a tile address based on a zoom level and \
         a point in the tile"
@@ -229,7 +302,7 @@ class _TileGrid(object):
         assert y <= self.MAXY and y >= self.MINY
         assert zoom in range(0, len(self.RESOLUTIONS))
 
-        tileS = self.tileSize(zoom)
+        tileS = self._tileSizes[int(zoom)]
         offsetX = abs(x - self.MINX)
         if self.originCorner == 'bottom-left':
             offsetY = abs(y - self.MINY)
@@ -244,50 +317,344 @@ class _TileGrid(object):
             row = max(0, row - 1)
         return [int(math.floor(col)), int(math.floor(row))]
 
+    def tileAddressUnchecked(self, zoom, point):
+        """
+        Same as tileAddress without validation, zoom must be a valid int
+        and the point must be within the grid extent
+        """
+        x, y = point
+        tileS = self._tileSizes[zoom]
+        col = (x - self.MINX) / tileS
+        if self.originCorner == 'top-left':
+            row = (self.MAXY - y) / tileS
+        else:
+            row = (y - self.MINY) / tileS
+        # We are exactly on the edge of a tile and the extent
+        if (x == self.MINX or x == self.MAXX) and col.is_integer():
+            col = max(0, col - 1)
+        if (y == self.MINY or y == self.MAXY) and row.is_integer():
+            row = max(0, row - 1)
+        return [int(col), int(row)]
+
+    def tileAddresses(self, zoom, xs, ys=None):
+        """
+        Return the tile addresses of many points at once as an (N, 2) int
+        array of [col, row]. Same rules as tileAddress.
+        Parameters:
+            zoom -- the zoom level
+            xs -- the x coordinates or an (N, 2) array of [x, y] points
+            ys (optional) -- the y coordinates, required if xs only holds
+                             the x coordinates
+        """
+        requireNumpy()
+        if ys is None:
+            points = np.asarray(xs, dtype=np.float64).reshape(-1, 2)
+            xs = points[:, 0]
+            ys = points[:, 1]
+        else:
+            xs = np.asarray(xs, dtype=np.float64).ravel()
+            ys = np.asarray(ys, dtype=np.float64).ravel()
+        assert xs.shape == ys.shape
+        assert np.all((xs <= self.MAXX) & (xs >= self.MINX))
+        assert np.all((ys <= self.MAXY) & (ys >= self.MINY))
+        assert zoom in range(0, len(self.RESOLUTIONS))
+
+        tileS = self.tileSize(zoom)
+        offsetX = np.abs(xs - self.MINX)
+        if self.originCorner == 'bottom-left':
+            offsetY = np.abs(ys - self.MINY)
+        elif self.originCorner == 'top-left':
+            offsetY = np.abs(self.MAXY - ys)
+        cols = offsetX / tileS
+        rows = offsetY / tileS
+        # We are exactly on the edge of a tile and the extent
+        onEdge = ((xs == self.MINX) | (xs == self.MAXX)) & (cols == np.floor(cols))
+        cols = np.where(onEdge, np.maximum(0, cols - 1), cols)
+        onEdge = ((ys == self.MINY) | (ys == self.MAXY)) & (rows == np.floor(rows))
+        rows = np.where(onEdge, np.maximum(0, rows - 1), rows)
+        addresses = np.empty((xs.shape[0], 2), dtype=np.int64)
+        addresses[:, 0] = np.floor(cols)
+        addresses[:, 1] = np.floor(rows)
+        return addresses
+
     def intersectsExtent(self, extent):
         "Determine if an extent intersects this instance extent"
         return \
             self.extent[0] <= extent[2] and self.extent[2] >= extent[0] and \
             self.extent[1] <= extent[3] and self.extent[3] >= extent[1]
 
-    def iterGrid(self, minZoom, maxZoom):
-        "Yields the tileBounds, zoom, tileCol and tileRow"
+    def iterGrid(self, minZoom, maxZoom, order='row-major', start=None, stop=None):
+        """
+        Yields the tileBounds, zoom, tileCol and tileRow
+        Parameters:
+            minZoom -- the first zoom level
+            maxZoom -- the last zoom level
+            order (optional) -- the tile order within a zoom level,
+                                'row-major' (the default), 'z-order' or
+                                'hilbert' (generalized Hilbert curve, works
+                                with non square extents)
+            start (optional) -- the index of the first tile to yield
+            stop (optional) -- the index after the last tile to yield
+        Zoom levels outside of [start, stop) are skipped without iterating
+        them. In row-major order the first tile is reached directly, in
+        the other orders the tiles before start within its zoom level are
+        skipped one by one.
+        """
         assert minZoom in range(0, len(self.RESOLUTIONS))
         assert maxZoom in range(0, len(self.RESOLUTIONS))
         assert minZoom <= maxZoom
+        assert order in ('row-major', 'z-order', 'hilbert')
+        start = 0 if start is None else start
+        assert start >= 0
+        assert stop is None or stop >= 0
 
+        offset = 0
         for zoom in range(minZoom, maxZoom + 1):
-            [minRow, minCol, maxRow, maxCol] = self.getExtentAddress(zoom)
-            for row in range(minRow, maxRow + 1):
-                for col in range(minCol, maxCol + 1):
-                    tileBounds = self.tileBounds(zoom, col, row)
+            zoomStats = self.zoomTable[zoom]
+            [minRow, minCol, maxRow, maxCol] = zoomStats['extentAddress']
+            nbTilesX = zoomStats['nbTilesX']
+            # The [first, last] indices to yield within this zoom level
+            first = max(start - offset, 0)
+            last = zoomStats['nbTiles'] - 1
+            if stop is not None:
+                last = min(stop - offset - 1, last)
+            offset += zoomStats['nbTiles']
+            if first > last:
+                if stop is not None and offset >= stop:
+                    return
+                continue
+            if order != 'row-major':
+                if order == 'z-order':
+                    addresses = morton.iterZOrder(minCol, minRow, maxCol, maxRow)
+                else:
+                    addresses = iterHilbert(minCol, minRow, maxCol, maxRow)
+                for col, row in itertools.islice(addresses, first, last + 1):
+                    tileBounds = self.tileBoundsUnchecked(zoom, col, row)
+                    yield (tileBounds, zoom, col, row)
+                continue
+            firstRow = minRow + first // nbTilesX
+            lastRow = minRow + last // nbTilesX
+            for row in range(firstRow, lastRow + 1):
+                rowMinCol = minCol + first % nbTilesX if row == firstRow else minCol
+                rowMaxCol = minCol + last % nbTilesX if row == lastRow else maxCol
+                for col in range(rowMinCol, rowMaxCol + 1):
+                    # zoom has been validated above
+                    tileBounds = self.tileBoundsUnchecked(zoom, col, row)
                     yield (tileBounds, zoom, col, row)
 
+    def tileAtIndex(self, index, minZoom, maxZoom):
+        """
+        Return the [zoom, tileCol, tileRow] of the tile at a given index of
+        iterGrid(minZoom, maxZoom) (row-major order)
+        """
+        assert minZoom in range(0, len(self.RESOLUTIONS))
+        assert maxZoom in range(0, len(self.RESOLUTIONS))
+        assert minZoom <= maxZoom
+        assert index >= 0, 'Tile index out of range'
+        for zoom in range(minZoom, maxZoom + 1):
+            zoomStats = self.zoomTable[zoom]
+            if index < zoomStats['nbTiles']:
+                [minRow, minCol, maxRow, maxCol] = zoomStats['extentAddress']
+                row, col = divmod(index, zoomStats['nbTilesX'])
+                tileAddress = [zoom, minCol + col, minRow + row]
+                if self.useTileTypes:
+                    return TileAddress._make(tileAddress)
+                return tileAddress
+            index -= zoomStats['nbTiles']
+        raise AssertionError('Tile index out of range')
+
+    def indexOfTile(self, zoom, col, row, minZoom, maxZoom):
+        """
+        Return the index of a tile in iterGrid(minZoom, maxZoom) (row-major
+        order), the inverse of tileAtIndex
+        """
+        assert minZoom in range(0, len(self.RESOLUTIONS))
+        assert maxZoom in range(0, len(self.RESOLUTIONS))
+        assert minZoom <= zoom <= maxZoom
+        zoomTable = self.zoomTable
+        [minRow, minCol, maxRow, maxCol] = zoomTable[zoom]['extentAddress']
+        assert minCol <= col <= maxCol and minRow <= row <= maxRow, \
+            'Tile address out of the grid extent'
+        index = (row - minRow) * zoomTable[zoom]['nbTilesX'] + col - minCol
+        index += zoomTable[zoom - 1]['cumulativeNbTiles'] if zoom > 0 else 0
+        if minZoom > 0:
+            index -= zoomTable[minZoom - 1]['cumulativeNbTiles']
+        return index
+
+    def iterGridBlocks(self, minZoom, maxZoom, blockSize=65536):
+        """
+        Yields the tiles of iterGrid in blocks of up to blockSize tiles as
+        (tilesBounds, zoom, tileCols, tileRows), where tilesBounds is an
+        (N, 4) array and tileCols and tileRows are arrays of length N.
+        Blocks never span several zoom levels and the tile order is the
+        same as iterGrid.
+        """
+        requireNumpy()
+        assert minZoom in range(0, len(self.RESOLUTIONS))
+        assert maxZoom in range(0, len(self.RESOLUTIONS))
+        assert minZoom <= maxZoom
+        assert blockSize > 0
+
+        for zoom in range(minZoom, maxZoom + 1):
+            [minRow, minCol, maxRow, maxCol] = self.getExtentAddress(zoom)
+            nbCols = maxCol - minCol + 1
+            nbTiles = nbCols * (maxRow - minRow + 1)
+            for start in range(0, nbTiles, blockSize):
+                indices = np.arange(start, min(start + blockSize, nbTiles), dtype=np.int64)
+                rows = minRow + indices // nbCols
+                cols = minCol + indices % nbCols
+                yield (self.tileBoundsArray(zoom, cols, rows), zoom, cols, rows)
+
+    async def aiterGrid(self, minZoom, maxZoom, order='row-major', batchSize=1024):
+        """
+        Async counterpart of iterGrid, yields lists of up to batchSize
+        (tileBounds, zoom, tileCol, tileRow) in the iterGrid order and gives
+        control back to the event loop between batches.
+        Parameters:
+            see iterGrid
+            batchSize (optional) -- the number of tiles per batch
+        """
+        assert batchSize > 0
+        tiles = self.iterGrid(minZoom, maxZoom, order=order)
+        while True:
+            batch = list(itertools.islice(tiles, batchSize))
+            if not batch:
+                break
+            yield batch
+            await asyncio.sleep(0)
+
+    async def fillGridQueue(
+        self, queue, minZoom, maxZoom, order='row-major', batchSize=1024, sentinel=None
+    ):
+        """
+        Put the aiterGrid batches into an asyncio.Queue followed by sentinel.
+        With a bounded queue (maxsize > 0) the producer waits for the
+        consumers instead of running ahead of them.
+        Returns the number of tiles.
+        Parameters:
+            queue -- the asyncio.Queue
+            see aiterGrid
+            sentinel (optional) -- put after the last batch
+        """
+        nbTiles = 0
+        async for batch in self.aiterGrid(minZoom, maxZoom, order=order, batchSize=batchSize):
+            await queue.put(batch)
+            nbTiles += len(batch)
+        await queue.put(sentinel)
+        return nbTiles
+
+    @property
+    def zoomTable(self):
+        """
+        Per zoom statistics of this instance extent, computed once on first
+        access. Each entry is a dict with the keys:
+            extentAddress -- [minRow, minCol, maxRow, maxCol]
+            nbTilesX -- the number of tiles over x
+            nbTilesY -- the number of tiles over y
+            nbTiles -- the number of tiles
+            cumulativeNbTiles -- the number of tiles from zoom 0 up to and
+                                 including this zoom
+            tileSize -- the size (in meters) of a tile
+        """
+        if getattr(self, '_zoomTable', None) is None:
+            zoomTable = []
+            cumulativeNbTiles = 0
+            for zoom in range(0, len(self.RESOLUTIONS)):
+                [minRow, minCol, maxRow, maxCol] = self.getExtentAddress(zoom)
+                nbTilesX = maxCol - minCol + 1
+                nbTilesY = maxRow - minRow + 1
+                cumulativeNbTiles += nbTilesX * nbTilesY
+                zoomTable.append({
+                    'extentAddress': [minRow, minCol, maxRow, maxCol],
+                    'nbTilesX': nbTilesX,
+                    'nbTilesY': nbTilesY,
+                    'nbTiles': nbTilesX * nbTilesY,
+                    'cumulativeNbTiles': cumulativeNbTiles,
+                    'tileSize': self.tileSize(zoom)
+                })
+            self._zoomTable = zoomTable
+        return self._zoomTable
+
+    def precompute(self):
+        "Compute the lazily built zoom tables at once and return the zoomTable"
+        zoomTable = self.zoomTable
+        self._zoomRatio(0, 0)
+        return zoomTable
+
+    def freeze(self):
+        """
+        Precompute the zoom tables and make the instance read only: the
+        extent, origin, resolutions and zoom tables become immutable and
+        assigning an attribute raises an AttributeError. Returns the instance.
+        """
+        if self.__dict__.get('_frozen', False):
+            return self
+        self.extent = tuple(self.extent)
+        self.origin = tuple(self.origin)
+        if 'RESOLUTIONS' in self.__dict__:
+            self.RESOLUTIONS = tuple(self.RESOLUTIONS)
+        # After the assignments above, which drop the caches
+        self.precompute()
+        self._tileSizes = tuple(self._tileSizes)
+        self._zoomTable = tuple(
+            MappingProxyType(dict(z, extentAddress=tuple(z['extentAddress'])))
+            for z in self._zoomTable
+        )
+        self._zoomRatios = tuple(tuple(ratios) for ratios in self._zoomRatios)
+        self._frozen = True
+        return self
+
+    def _resetCaches(self):
+        # Drop the tables derived from the attributes of _CACHE_SOURCES
+        for name in _CACHES:
+            self.__dict__.pop(name, None)
+        if '_tileSizes' in self.__dict__:
+            self.__dict__['_tileSizes'] = [self.tileSizePx * res for res in self.RESOLUTIONS]
+
+    def __setattr__(self, name, value):
+        # Frozen instances only accept the first assignment of private lazy caches
+        if self.__dict__.get('_frozen', False) and \
+                not (name.startswith('_') and name not in self.__dict__):
+            raise AttributeError(f'{type(self).__name__} instance is read only')
+        object.__setattr__(self, name, value)
+        if name in _CACHE_SOURCES:
+            self._resetCaches()
+
+    def __delattr__(self, name):
+        if self.__dict__.get('_frozen', False):
+            raise AttributeError(f'{type(self).__name__} instance is read only')
+        object.__delattr__(self, name)
+
     def numberOfXTilesAtZoom(self, zoom):
         "Returns the number of tiles over x at a given zoom level"
-        [minRow, minCol, maxRow, maxCol] = self.getExtentAddress(zoom)
-        return maxCol - minCol + 1
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        return self.zoomTable[zoom]['nbTilesX']
 
     def numberOfYTilesAtZoom(self, zoom):
         "Retruns the number of tiles over y at a given zoom level"
-        [minRow, minCol, maxRow, maxCol] = self.getExtentAddress(zoom)
-        return maxRow - minRow + 1
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        return self.zoomTable[zoom]['nbTilesY']
 
     def numberOfTilesAtZoom(self, zoom):
         "Returns the total number of tile at a given zoom level"
-        [minRow, minCol, maxRow, maxCol] = self.getExtentAddress(zoom)
-        return (maxCol - minCol + 1) * (maxRow - minRow + 1)
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        return self.zoomTable[zoom]['nbTiles']
 
     def totalNumberOfTiles(self, minZoom=None, maxZoom=None):
         "Return the total number of tiles for this instance extent"
-        nbTiles = 0
         minZoom = minZoom or 0
         if maxZoom:
             maxZoom = maxZoom + 1
         else:
             maxZoom = len(self.RESOLUTIONS)
-        for zoom in range(minZoom, maxZoom):
-            nbTiles += self.numberOfTilesAtZoom(zoom)
+        assert minZoom in range(0, len(self.RESOLUTIONS))
+        assert maxZoom <= len(self.RESOLUTIONS)
+        if minZoom >= maxZoom:
+            return 0
+        zoomTable = self.zoomTable
+        nbTiles = zoomTable[maxZoom - 1]['cumulativeNbTiles']
+        if minZoom > 0:
+            nbTiles -= zoomTable[minZoom - 1]['cumulativeNbTiles']
         return nbTiles
 
     def getResolution(self, zoom):
@@ -349,6 +716,70 @@ class _TileGrid(object):
             return hi - 1
         return lo + 1
 
+    def _getZoomLevelRanges(self, resolutions, unit):
+        # Vectorized _getZoomLevelRange, returns the resolutions (or scales)
+        # as an array, the ascending resolutions (or scales) of the grid they
+        # compare to and the number of them greater than or equal to the values
+        requireNumpy()
+        assert unit in ('meters', 'degrees', 'scale')
+        resolutions = np.asarray(resolutions, dtype=np.float64)
+        nbResolutions = len(self.RESOLUTIONS)
+        if unit == 'scale':
+            # Compare to the scales of getScale so that they match exactly
+            if getattr(self, '_sortedScales', None) is None:
+                self._sortedScales = np.array(
+                    [self.getScale(z) for z in range(nbResolutions - 1, -1, -1)],
+                    dtype=np.float64
+                )
+            sortedValues = self._sortedScales
+            converted = resolutions
+        else:
+            if getattr(self, '_sortedResolutions', None) is None:
+                # Ascending for searchsorted
+                self._sortedResolutions = np.array(self.RESOLUTIONS[::-1], dtype=np.float64)
+            sortedValues = self._sortedResolutions
+            converted = resolutions
+            if unit == 'meters' and self.unit == 'degrees':
+                converted = resolutions / self.metersPerUnit
+            elif unit == 'degrees' and self.unit == 'meters':
+                converted = resolutions * EPSG4326_METERS_PER_UNIT
+        lo = nbResolutions - np.searchsorted(sortedValues, converted, side='left')
+        return resolutions, sortedValues, lo
+
+    def getClosestZooms(self, resolutions, unit='meters'):
+        """
+        Vectorized getClosestZoom, returns an int64 array of zoom levels
+        Parameters:
+            resolutions -- an array of resolutions (or scales)
+            unit -- 'meters' (default), 'degrees' or 'scale' (compared to
+                    the scales of getScale)
+        """
+        resolutions, sortedValues, lo = self._getZoomLevelRanges(resolutions, unit)
+        valuesDesc = sortedValues[::-1]
+        nbResolutions = len(self.RESOLUTIONS)
+        inner = np.clip(lo, 1, nbResolutions - 1)
+        closer = np.abs(valuesDesc[inner] - resolutions) < \
+            np.abs(valuesDesc[inner - 1] - resolutions)
+        zooms = np.where(closer, inner, inner - 1)
+        zooms = np.where(lo == nbResolutions, nbResolutions - 1, zooms)
+        return np.where(lo == 0, 0, zooms).astype(np.int64)
+
+    def getCeilingZooms(self, resolutions, unit='meters'):
+        """
+        Vectorized getCeilingZoom, returns an int64 array of zoom levels
+        Parameters:
+            resolutions -- an array of resolutions (or scales)
+            unit -- 'meters' (default), 'degrees' or 'scale' (compared to
+                    the scales of getScale)
+        """
+        resolutions, sortedValues, lo = self._getZoomLevelRanges(resolutions, unit)
+        nbResolutions = len(self.RESOLUTIONS)
+        # Resolutions (or scales) of the grid return their own zoom level
+        # (before any unit conversion), the first one if it appears several times
+        index = np.searchsorted(sortedValues, resolutions, side='right') - 1
+        exact = (index >= 0) & (sortedValues[np.maximum(index, 0)] == resolutions)
+        return np.where(exact, nbResolutions - 1 - index, lo).astype(np.int64)
+
     def getScale(self, zoom):
         """Returns the scale at a given zoom level"""
         if self.unit == 'degrees':
@@ -401,6 +832,78 @@ class _TileGrid(object):
                     maxRow -= 1
         return [minRow, minCol, maxRow, maxCol]
 
+    def getPolygonAddressRanges(self, zoom, polygon):
+        """
+        Return the [row, minCol, maxCol] address ranges, sorted by row then
+        col, of the tiles intersecting a polygon within the instance's extent.
+        Uses a scanline rasterization over the tile lattice, the tiles of the
+        polygon's bbox are never tested one by one.
+        Parameters:
+            zoom -- the zoom level
+            polygon -- a ring, a polygon (list of rings, the first one being
+                       the exterior) or a multipolygon (list of polygons).
+                       Rings are lists of [x, y].
+        """
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        tileSize = self._tileSizes[zoom]
+        rings = []
+        for ring in polygonRings(polygon):
+            if self.originCorner == 'bottom-left':
+                rings.append([[(x - self.MINX) / tileSize, (y - self.MINY) / tileSize]
+                              for x, y in ring])
+            elif self.originCorner == 'top-left':
+                rings.append([[(x - self.MINX) / tileSize, (self.MAXY - y) / tileSize]
+                              for x, y in ring])
+        [minRow, minCol, maxRow, maxCol] = self.zoomTable[zoom]['extentAddress']
+        return rasterizeRings(rings, minRow, maxRow, minCol, maxCol)
+
+    def iterPolygon(self, polygon, minZoom, maxZoom):
+        """
+        Yields the tileBounds, zoom, tileCol and tileRow of the tiles
+        intersecting a polygon, see getPolygonAddressRanges
+        """
+        assert minZoom in range(0, len(self.RESOLUTIONS))
+        assert maxZoom in range(0, len(self.RESOLUTIONS))
+        assert minZoom <= maxZoom
+
+        for zoom in range(minZoom, maxZoom + 1):
+            for [row, minCol, maxCol] in self.getPolygonAddressRanges(zoom, polygon):
+                for col in range(minCol, maxCol + 1):
+                    tileBounds = self.tileBoundsUnchecked(zoom, col, row)
+                    yield (tileBounds, zoom, col, row)
+
+    def numberOfTilesInPolygon(self, polygon, zoom):
+        "Returns the number of tiles intersecting a polygon at a given zoom level"
+        return sum(
+            maxCol - minCol + 1
+            for [row, minCol, maxCol] in self.getPolygonAddressRanges(zoom, polygon)
+        )
+
+    def _zoomRatio(self, zoomFrom, zoomTo):
+        """
+        Return the tile size ratio between two zoom levels as integers
+        (num, den), so that tileSize(zoomFrom) / tileSize(zoomTo) == num / den.
+        The ratios of all the zoom pairs are computed once. The resolutions
+        are rounded to rationals with small denominators, which keeps
+        float noise (e.g. 256 * 0.1) out of the address mappings.
+        """
+        if getattr(self, '_zoomRatios', None) is None:
+            nbZooms = len(self.RESOLUTIONS)
+            zoomRatios = []
+            for zFrom in range(0, nbZooms):
+                ratios = []
+                for zTo in range(0, nbZooms):
+                    ratio = self.RESOLUTIONS[zFrom] / self.RESOLUTIONS[zTo]
+                    if ratio >= 1:
+                        fraction = Fraction(ratio).limit_denominator(10**6)
+                    else:
+                        fraction = 1 / Fraction(1 / ratio).limit_denominator(10**6)
+                    assert abs(float(fraction) - ratio) <= 1e-9 * ratio
+                    ratios.append((fraction.numerator, fraction.denominator))
+                zoomRatios.append(ratios)
+            self._zoomRatios = zoomRatios
+        return self._zoomRatios[zoomFrom][zoomTo]
+
     def getParentTiles(self, zoom, col, row, zoomParent):
         """
         Return the parent tile(s) for an irregular (not following quadindex)
@@ -412,17 +915,141 @@ class _TileGrid(object):
             zoomParent -- the target zoom of the parent tile
         """
         assert zoomParent <= zoom
-        if zoomParent == zoom:
-            return [[zoom, col, row]]
-        extent = self.tileBounds(zoom, col, row)
-        minRow, minCol, maxRow, maxCol = self.getExtentAddress(
-            zoomParent, extent=extent, contained=True)
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        assert zoomParent in range(0, len(self.RESOLUTIONS))
+        addressType = TileAddress._make if self.useTileTypes else list
+        # Parents whose interior intersects the child tile, all tiles share
+        # the same origin so col and row are mapped the same way
+        num, den = self._zoomRatio(zoom, zoomParent)
+        minCol = (col * num) // den
+        maxCol = -((-(col + 1) * num) // den) - 1
+        minRow = (row * num) // den
+        maxRow = -((-(row + 1) * num) // den) - 1
         addresses = []
         for c in range(minCol, maxCol + 1):
             for r in range(minRow, maxRow + 1):
-                addresses.append([zoomParent, c, r])
+                addresses.append(addressType([zoomParent, c, r]))
         return addresses
 
+    def getChildTiles(self, zoom, col, row, zoomChild):
+        """
+        Return the child tile(s) within the instance's extent for an
+        irregular (not following quadindex) and regular tiling scheme
+        Parameters:
+            zoom -- the zoom level a the parent tile
+            row -- the row of the parent tile
+            col -- the col of the parent tile
+            zoomChild -- the target zoom of the child tiles
+        """
+        assert zoomChild >= zoom
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        assert zoomChild in range(0, len(self.RESOLUTIONS))
+        addressType = TileAddress._make if self.useTileTypes else list
+        num, den = self._zoomRatio(zoom, zoomChild)
+        [minRowExtent, minColExtent, maxRowExtent, maxColExtent] = \
+            self.zoomTable[zoomChild]['extentAddress']
+        minCol = max((col * num) // den, minColExtent)
+        maxCol = min(-((-(col + 1) * num) // den) - 1, maxColExtent)
+        minRow = max((row * num) // den, minRowExtent)
+        maxRow = min(-((-(row + 1) * num) // den) - 1, maxRowExtent)
+        addresses = []
+        for c in range(minCol, maxCol + 1):
+            for r in range(minRow, maxRow + 1):
+                addresses.append(addressType([zoomChild, c, r]))
+        return addresses
+
+    def getParentTileRanges(self, zoom, cols, rows, zoomParent):
+        """
+        Vectorized getParentTiles. Returns an (N, 4) int array of the parent
+        tiles address ranges [minRow, minCol, maxRow, maxCol].
+        """
+        requireNumpy()
+        assert zoomParent <= zoom
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        assert zoomParent in range(0, len(self.RESOLUTIONS))
+        num, den = self._zoomRatio(zoom, zoomParent)
+        return self._mapTileRanges(cols, rows, num, den)
+
+    def getChildTileRanges(self, zoom, cols, rows, zoomChild):
+        """
+        Vectorized getChildTiles. Returns an (N, 4) int array of the child
+        tiles address ranges [minRow, minCol, maxRow, maxCol] within the
+        instance's extent, with minRow > maxRow or minCol > maxCol if a
+        parent tile has no child within the extent.
+        """
+        requireNumpy()
+        assert zoomChild >= zoom
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        assert zoomChild in range(0, len(self.RESOLUTIONS))
+        num, den = self._zoomRatio(zoom, zoomChild)
+        ranges = self._mapTileRanges(cols, rows, num, den)
+        [minRow, minCol, maxRow, maxCol] = self.zoomTable[zoomChild]['extentAddress']
+        # Each bound is clipped on its own side so that empty ranges stay empty
+        np.maximum(ranges[:, 0], minRow, out=ranges[:, 0])
+        np.maximum(ranges[:, 1], minCol, out=ranges[:, 1])
+        np.minimum(ranges[:, 2], maxRow, out=ranges[:, 2])
+        np.minimum(ranges[:, 3], maxCol, out=ranges[:, 3])
+        return ranges
+
+    def _mapTileRanges(self, cols, rows, num, den):
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        assert cols.shape == rows.shape
+        ranges = np.empty((cols.shape[0], 4), dtype=np.int64)
+        ranges[:, 0] = (rows * num) // den
+        ranges[:, 1] = (cols * num) // den
+        ranges[:, 2] = -((-(rows + 1) * num) // den) - 1
+        ranges[:, 3] = -((-(cols + 1) * num) // den) - 1
+        return ranges
+
+    @property
+    def isRegular(self):
+        "True if each zoom level halves the resolution of the previous one"
+        isRegular = self.__dict__.get('_isRegular')
+        if isRegular is None:
+            res = self.RESOLUTIONS
+            isRegular = all(
+                abs(res[z] / res[z + 1] - 2.0) < 1e-9 for z in range(0, len(res) - 1)
+            )
+            self._isRegular = isRegular
+        return isRegular
+
+    def mortonKey(self, zoom, col, row):
+        """
+        Return a single integer key of a tile for regular grids. Keys sort
+        by zoom level then in Z-order, so that close tiles get close keys.
+        """
+        assert self.isRegular, 'Morton keys are only supported by regular grids'
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        return morton.encode(zoom, col, row)
+
+    def tileFromMortonKey(self, key):
+        "Return the [zoom, col, row] of a key created with mortonKey"
+        assert self.isRegular, 'Morton keys are only supported by regular grids'
+        return morton.decode(key)
+
+    def mortonKeys(self, zoom, cols, rows):
+        "Vectorized mortonKey, returns an uint64 array"
+        assert self.isRegular, 'Morton keys are only supported by regular grids'
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        return morton.encodeArray(zoom, cols, rows)
+
+    def tilesFromMortonKeys(self, keys):
+        "Vectorized tileFromMortonKey, returns the zooms, cols and rows arrays"
+        assert self.isRegular, 'Morton keys are only supported by regular grids'
+        return morton.decodeArray(keys)
+
+    def quadKey(self, zoom, col, row):
+        "Return the quadkey string of a tile, requires a single tile at zoom 0"
+        assert self.isRegular, 'Quadkeys are only supported by regular grids'
+        assert zoom in range(0, len(self.RESOLUTIONS))
+        return morton.toQuadKey(zoom, col, row)
+
+    def tileFromQuadKey(self, quadKey):
+        "Return the [zoom, col, row] of a quadkey string"
+        assert self.isRegular, 'Quadkeys are only supported by regular grids'
+        return morton.fromQuadKey(quadKey)
+
     @property
     def xSpan(self):
         "Returns the range in meters/decimal of arcs over x"
@@ -436,37 +1063,61 @@ class _TileGrid(object):
 
 class GeoadminTileGridLV03(_LV03Base, _TileGrid):
 
-    def __init__(self, extent=None, tileSizePx=256.0, originCorner='top-left', useSwissExtent=True):
+    def __init__(
+        self,
+        extent=None,
+        tileSizePx=256.0,
+        originCorner='top-left',
+        useSwissExtent=True,
+        useTileTypes=False
+    ):
 
         super().__init__(
             extent=extent,
             tileSizePx=tileSizePx,
             originCorner=originCorner,
-            useSwissExtent=useSwissExtent
+            useSwissExtent=useSwissExtent,
+            useTileTypes=useTileTypes
         )
 
 
 class GeoadminTileGridLV95(_LV95Base, _TileGrid):
 
-    def __init__(self, extent=None, tileSizePx=256.0, originCorner='top-left', useSwissExtent=True):
+    def __init__(
+        self,
+        extent=None,
+        tileSizePx=256.0,
+        originCorner='top-left',
+        useSwissExtent=True,
+        useTileTypes=False
+    ):
 
         super().__init__(
             extent=extent,
             tileSizePx=tileSizePx,
             originCorner=originCorner,
-            useSwissExtent=useSwissExtent
+            useSwissExtent=useSwissExtent,
+            useTileTypes=useTileTypes
         )
 
 
 class GlobalMercatorTileGrid(_MercatorBase, _TileGrid):
 
-    def __init__(self, extent=None, tileSizePx=256.0, originCorner='top-left', useSwissExtent=True):
+    def __init__(
+        self,
+        extent=None,
+        tileSizePx=256.0,
+        originCorner='top-left',
+        useSwissExtent=True,
+        useTileTypes=False
+    ):
 
         super().__init__(
             extent=extent,
             tileSizePx=tileSizePx,
             originCorner=originCorner,
-            useSwissExtent=useSwissExtent
+            useSwissExtent=useSwissExtent,
+            useTileTypes=useTileTypes
         )
 
 
@@ -478,7 +1129,8 @@ class GlobalGeodeticTileGrid(_GeodeticBase, _TileGrid):
         tileSizePx=256.0,
         originCorner='top-left',
         tmsCompatible=True,
-        useSwissExtent=True
+        useSwissExtent=True,
+        useTileTypes=False
     ):
 
         super().__init__(
@@ -486,5 +1138,6 @@ class GlobalGeodeticTileGrid(_GeodeticBase, _TileGrid):
             tileSizePx=tileSizePx,
             originCorner=originCorner,
             tmsCompatible=tmsCompatible,
-            useSwissExtent=useSwissExtent
+            useSwissExtent=useSwissExtent,
+            useTileTypes=useTileTypes
         )
@@ -0,0 +1,229 @@
+import mmap
+import os
+import struct
+
+from ._compat import np
+from ._compat import requireNumpy
+from .bitmap import ORIGIN_CORNERS
+from .bitmap import _resolutionsDigest
+from .tiletypes import TileAddress
+from .tiletypes import TileBounds
+
+MAGIC = b'GATL'
+VERSION = 2
+# magic, version, srs, originCorner, flags, tileSizePx, extent, number of records,
+# digest of the resolutions
+HEADER = struct.Struct('<4sHIBBxxd4dQ8s')
+# zoom, tileCol, tileRow and the optional minX, minY, maxX, maxY
+RECORD = struct.Struct('<BII')
+RECORD_WITH_BOUNDS = struct.Struct('<BII4d')
+FLAG_BOUNDS = 1
+
+
+def _recordDtype(withBounds):
+    fields = [('zoom', 'u1'), ('tileCol', '<u4'), ('tileRow', '<u4')]
+    if withBounds:
+        fields += [('minX', '<f8'), ('minY', '<f8'), ('maxX', '<f8'), ('maxY', '<f8')]
+    return np.dtype(fields)
+
+
+def _header(tileGrid, withBounds, nbRecords):
+    return HEADER.pack(
+        MAGIC,
+        VERSION,
+        tileGrid.spatialReference,
+        ORIGIN_CORNERS.index(tileGrid.originCorner),
+        FLAG_BOUNDS if withBounds else 0,
+        tileGrid.tileSizePx,
+        *tileGrid.extent,
+        nbRecords,
+        _resolutionsDigest(tileGrid)
+    )
+
+
+class TileListWriter:
+    """
+    Streams tile addresses to a binary file of fixed width records
+    (zoom, tileCol, tileRow), optionally followed by the float64 tile bounds,
+    after a header recording the grid parameters. Use it as a context
+    manager, the number of records is written on close. If the block
+    raises, the incomplete file is removed.
+    Parameters:
+        path -- the file path
+        tileGrid -- the tile grid instance
+        withBounds (optional) -- also store the tile bounds
+        bufferSize (optional) -- the number of records written at once
+    """
+
+    def __init__(self, path, tileGrid, withBounds=False, bufferSize=65536):
+        assert bufferSize > 0
+        self.tileGrid = tileGrid
+        self.withBounds = withBounds
+        self.bufferSize = bufferSize
+        self.path = path
+        self.nbRecords = 0
+        self._record = RECORD_WITH_BOUNDS if withBounds else RECORD
+        self._buffer = []
+        self._file = open(path, 'wb')
+        self._file.write(_header(tileGrid, withBounds, 0))
+
+    def write(self, zoom, tileCol, tileRow, tileBounds=None):
+        "Append a tile, the bounds are computed if needed and not given"
+        if self.withBounds:
+            if tileBounds is None:
+                tileBounds = self.tileGrid.tileBounds(zoom, tileCol, tileRow)
+            self._buffer.append(self._record.pack(zoom, tileCol, tileRow, *tileBounds))
+        else:
+            self._buffer.append(self._record.pack(zoom, tileCol, tileRow))
+        if len(self._buffer) >= self.bufferSize:
+            self._flush()
+
+    def writeTiles(self, tiles):
+        "Append the (tileBounds, zoom, tileCol, tileRow) of iterGrid or iterPolygon"
+        for tileBounds, zoom, tileCol, tileRow in tiles:
+            self.write(zoom, tileCol, tileRow, tileBounds)
+
+    def writeBlocks(self, blocks):
+        "Append the (tilesBounds, zoom, tileCols, tileRows) blocks of iterGridBlocks"
+        requireNumpy()
+        self._flush()
+        dtype = _recordDtype(self.withBounds)
+        for tilesBounds, zoom, tileCols, tileRows in blocks:
+            records = np.empty(len(tileCols), dtype=dtype)
+            records['zoom'] = zoom
+            records['tileCol'] = tileCols
+            records['tileRow'] = tileRows
+            if self.withBounds:
+                for i, name in enumerate(('minX', 'minY', 'maxX', 'maxY')):
+                    records[name] = tilesBounds[:, i]
+            self._file.write(records.tobytes())
+            self.nbRecords += len(records)
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(b''.join(self._buffer))
+            self.nbRecords += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        "Write the buffered records and the header, then close the file"
+        if self._file is not None:
+            self._flush()
+            self._file.seek(0)
+            self._file.write(_header(self.tileGrid, self.withBounds, self.nbRecords))
+            self._file.close()
+            self._file = None
+
+    def abort(self):
+        "Close and remove an incomplete file"
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.unlink(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class TileListReader:
+    """
+    Maps a TileListWriter file with mmap for random access to its records
+    without loading it.
+    Parameters:
+        path -- the file path
+        tileGrid (optional) -- if given, must match the file header
+    """
+
+    def __init__(self, path, tileGrid=None):
+        self._file = open(path, 'rb')
+        self._mmap = None
+        try:
+            assert os.fstat(self._file.fileno()).st_size >= HEADER.size, 'Not a tile list file'
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._readHeader(tileGrid)
+        except Exception:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._file.close()
+            raise
+
+    def _readHeader(self, tileGrid):
+        header = HEADER.unpack_from(self._mmap, 0)
+        [magic, version, srs, origin, flags, tileSizePx] = header[:6]
+        assert magic == MAGIC and version == VERSION, 'Not a tile list file'
+        self.spatialReference = srs
+        self.originCorner = ORIGIN_CORNERS[origin]
+        self.withBounds = bool(flags & FLAG_BOUNDS)
+        self.tileSizePx = tileSizePx
+        self.extent = list(header[6:10])
+        self.nbRecords = header[10]
+        self._record = RECORD_WITH_BOUNDS if self.withBounds else RECORD
+        assert len(self._mmap) == HEADER.size + self.nbRecords * self._record.size, \
+            'Truncated or unclosed tile list file'
+        if tileGrid is not None:
+            assert header == HEADER.unpack(_header(tileGrid, self.withBounds, self.nbRecords)), \
+                'Tile list file does not match the tile grid'
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.nbRecords
+
+    def _unpack(self, index):
+        if index < 0:
+            index += self.nbRecords
+        if not 0 <= index < self.nbRecords:
+            raise IndexError('Tile list index out of range')
+        return self._record.unpack_from(self._mmap, HEADER.size + index * self._record.size)
+
+    def __getitem__(self, index):
+        "Return the TileAddress of a record"
+        return TileAddress._make(self._unpack(index)[:3])
+
+    def tileBounds(self, index):
+        "Return the stored TileBounds of a record"
+        assert self.withBounds, 'Tile list file without bounds'
+        return TileBounds._make(self._unpack(index)[3:])
+
+    def _iterRecords(self, chunkSize=65536):
+        recordSize = self._record.size
+        for start in range(0, self.nbRecords, chunkSize):
+            offset = HEADER.size + start * recordSize
+            size = (min(start + chunkSize, self.nbRecords) - start) * recordSize
+            yield from self._record.iter_unpack(self._mmap[offset:offset + size])
+
+    def __iter__(self):
+        "Yields the TileAddress of the records"
+        for record in self._iterRecords():
+            yield TileAddress._make(record[:3])
+
+    def iterTiles(self):
+        "Yields the (tileBounds, zoom, tileCol, tileRow) of the records like iterGrid"
+        assert self.withBounds, 'Tile list file without bounds'
+        for record in self._iterRecords():
+            yield (TileBounds._make(record[3:]), record[0], record[1], record[2])
+
+    def records(self):
+        """
+        Return the records as a read only NumPy structured array mapping the
+        file, it must be deleted before closing the reader
+        """
+        requireNumpy()
+        dtype = _recordDtype(self.withBounds)
+        return np.frombuffer(self._mmap, dtype=dtype, count=self.nbRecords, offset=HEADER.size)
@@ -0,0 +1,213 @@
+from bisect import bisect_right
+
+from .tiletypes import TileAddress
+
+
+def _unionCols(a, b):
+    intervals = sorted(a + b)
+    if not intervals:
+        return ()
+    merged = [list(intervals[0])]
+    for c0, c1 in intervals[1:]:
+        if c0 <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], c1)
+        else:
+            merged.append([c0, c1])
+    return tuple((c0, c1) for c0, c1 in merged)
+
+
+def _intersectionCols(a, b):
+    intervals = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        c0 = max(a[i][0], b[j][0])
+        c1 = min(a[i][1], b[j][1])
+        if c0 <= c1:
+            intervals.append((c0, c1))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return tuple(intervals)
+
+
+def _differenceCols(a, b):
+    intervals = []
+    j = 0
+    for c0, c1 in a:
+        while j < len(b) and b[j][1] < c0:
+            j += 1
+        k = j
+        while k < len(b) and b[k][0] <= c1:
+            if b[k][0] > c0:
+                intervals.append((c0, b[k][0] - 1))
+            c0 = max(c0, b[k][1] + 1)
+            k += 1
+        if c0 <= c1:
+            intervals.append((c0, c1))
+    return tuple(intervals)
+
+
+class TileRangeSet:
+    """
+    A set of tiles of a single zoom level stored as bands of rows sharing
+    the same merged column ranges, [(minRow, maxRow, ((minCol, maxCol), ...)), ...].
+    Set algebra, len, membership and iteration never expand the set to
+    individual tiles.
+    """
+
+    __slots__ = ('zoom', 'bands', '_len')
+
+    def __init__(self, zoom, bands=()):
+        self.zoom = zoom
+        self.bands = tuple(bands)
+        self._len = None
+
+    @classmethod
+    def fromExtentAddress(cls, zoom, extentAddress):
+        """
+        Create a set from a _TileGrid.getExtentAddress result
+        [minRow, minCol, maxRow, maxCol]
+        """
+        [minRow, minCol, maxRow, maxCol] = extentAddress
+        if minRow > maxRow or minCol > maxCol:
+            return cls(zoom)
+        return cls(zoom, [(minRow, maxRow, ((minCol, maxCol),))])
+
+    @classmethod
+    def fromExtentAddresses(cls, zoom, extentAddresses):
+        """
+        Create the union of many [minRow, minCol, maxRow, maxCol] extent
+        addresses in a single sweep over their rows
+        """
+        rectangles = sorted(
+            a for a in (list(a) for a in extentAddresses) if a[0] <= a[2] and a[1] <= a[3]
+        )
+        breakpoints = set()
+        for [minRow, minCol, maxRow, maxCol] in rectangles:
+            breakpoints.add(minRow)
+            breakpoints.add(maxRow + 1)
+        breakpoints = sorted(breakpoints)
+
+        bands = []
+        active = []
+        i = 0
+        for start, end in zip(breakpoints, breakpoints[1:]):
+            while i < len(rectangles) and rectangles[i][0] <= start:
+                active.append(rectangles[i])
+                i += 1
+            active = [r for r in active if r[2] >= start]
+            if not active:
+                continue
+            cols = _unionCols([(r[1], r[3]) for r in active], [])
+            if bands and bands[-1][1] + 1 == start and bands[-1][2] == cols:
+                bands[-1] = (bands[-1][0], end - 1, cols)
+            else:
+                bands.append((start, end - 1, cols))
+        return cls(zoom, bands)
+
+    @classmethod
+    def fromRanges(cls, zoom, ranges):
+        """
+        Create a set from [row, minCol, maxCol] ranges, for instance the
+        result of _TileGrid.getPolygonAddressRanges
+        """
+        rows = {}
+        for [row, minCol, maxCol] in ranges:
+            rows.setdefault(row, []).append((minCol, maxCol))
+        bands = []
+        for row in sorted(rows):
+            cols = _unionCols(rows[row], [])
+            if bands and bands[-1][1] + 1 == row and bands[-1][2] == cols:
+                bands[-1] = (bands[-1][0], row, cols)
+            else:
+                bands.append((row, row, cols))
+        return cls(zoom, bands)
+
+    def _combine(self, other, colsOperation):
+        assert isinstance(other, TileRangeSet)
+        assert self.zoom == other.zoom, 'Tile range sets of different zoom levels'
+        breakpoints = set()
+        for (minRow, maxRow, cols) in self.bands + other.bands:
+            breakpoints.add(minRow)
+            breakpoints.add(maxRow + 1)
+        breakpoints = sorted(breakpoints)
+
+        bands = []
+        i = j = 0
+        for start, end in zip(breakpoints, breakpoints[1:]):
+            while i < len(self.bands) and self.bands[i][1] < start:
+                i += 1
+            while j < len(other.bands) and other.bands[j][1] < start:
+                j += 1
+            colsA = self.bands[i][2] if i < len(self.bands) and \
+                self.bands[i][0] <= start else ()
+            colsB = other.bands[j][2] if j < len(other.bands) and \
+                other.bands[j][0] <= start else ()
+            cols = colsOperation(colsA, colsB)
+            if not cols:
+                continue
+            if bands and bands[-1][1] + 1 == start and bands[-1][2] == cols:
+                bands[-1] = (bands[-1][0], end - 1, cols)
+            else:
+                bands.append((start, end - 1, cols))
+        return TileRangeSet(self.zoom, bands)
+
+    def union(self, other):
+        return self._combine(other, _unionCols)
+
+    def intersection(self, other):
+        return self._combine(other, _intersectionCols)
+
+    def difference(self, other):
+        return self._combine(other, _differenceCols)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __len__(self):
+        if self._len is None:
+            self._len = sum(
+                (maxRow - minRow + 1) * sum(c1 - c0 + 1 for c0, c1 in cols)
+                for (minRow, maxRow, cols) in self.bands
+            )
+        return self._len
+
+    def __bool__(self):
+        return len(self.bands) > 0
+
+    def __contains__(self, tileAddress):
+        "Test if a [zoom, tileCol, tileRow] tile address is in the set"
+        [zoom, col, row] = tileAddress
+        if zoom != self.zoom:
+            return False
+        i = bisect_right(self.bands, (row, float('inf'))) - 1
+        if i < 0 or self.bands[i][1] < row:
+            return False
+        cols = self.bands[i][2]
+        k = bisect_right(cols, (col, float('inf'))) - 1
+        return k >= 0 and cols[k][1] >= col
+
+    def __iter__(self):
+        "Yields the tile addresses in row-major order"
+        for (row, minCol, maxCol) in self.iterRanges():
+            for col in range(minCol, maxCol + 1):
+                yield TileAddress(self.zoom, col, row)
+
+    def __eq__(self, other):
+        return isinstance(other, TileRangeSet) and \
+            self.zoom == other.zoom and self.bands == other.bands
+
+    def __hash__(self):
+        return hash((self.zoom, self.bands))
+
+    def __repr__(self):
+        return f'TileRangeSet(zoom={self.zoom}, bands={list(self.bands)})'
+
+    def iterRanges(self):
+        "Yields the [row, minCol, maxCol] ranges of the set in row-major order"
+        for (minRow, maxRow, cols) in self.bands:
+            for row in range(minRow, maxRow + 1):
+                for (minCol, maxCol) in cols:
+                    yield [row, minCol, maxCol]
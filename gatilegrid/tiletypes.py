@@ -0,0 +1,11 @@
+from collections import namedtuple
+
+
+class TileAddress(namedtuple('TileAddress', ['zoom', 'tileCol', 'tileRow'])):
+    "Immutable and hashable tile address [zoom, tileCol, tileRow]"
+    __slots__ = ()
+
+
+class TileBounds(namedtuple('TileBounds', ['minX', 'minY', 'maxX', 'maxY'])):
+    "Immutable and hashable tile or cell bounds [minX, minY, maxX, maxY]"
+    __slots__ = ()
@@ -0,0 +1,154 @@
+import gc
+import os
+import tempfile
+import threading
+import unittest
+import warnings
+
+from gatilegrid import GeoadminTileGridLV03
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import GlobalGeodeticTileGrid
+from gatilegrid import TileCoverageBitmap
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestTileCoverageBitmap(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpDir.name, 'coverage.bin')
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def testInMemory(self):
+        grid = GeoadminTileGridLV95()
+        zoom = 20
+        bitmap = TileCoverageBitmap(grid, zoom)
+        self.assertEqual(bitmap.nbCols, grid.numberOfXTilesAtZoom(zoom))
+        self.assertEqual(bitmap.nbRows, grid.numberOfYTilesAtZoom(zoom))
+        self.assertEqual(len(bitmap), 0)
+
+        bitmap.set(0, 0)
+        bitmap.set(187, 124)
+        bitmap.set(5, 7)
+        bitmap.set(5, 7)
+        self.assertTrue(bitmap.test(0, 0))
+        self.assertTrue(bitmap.test(187, 124))
+        self.assertFalse(bitmap.test(7, 5))
+        self.assertIn([zoom, 5, 7], bitmap)
+        self.assertNotIn([zoom + 1, 5, 7], bitmap)
+        self.assertNotIn([zoom, 500, 7], bitmap)
+        self.assertEqual(bitmap.count(), 3)
+        bitmap.set(5, 7, False)
+        self.assertFalse(bitmap.test(5, 7))
+        self.assertEqual(bitmap.count(), 2)
+
+        with self.assertRaises(AssertionError):
+            bitmap.set(188, 0)
+        with self.assertRaises(AssertionError):
+            bitmap.test(0, -1)
+
+    def testFileSharing(self):
+        grid = GeoadminTileGridLV95()
+        zoom = 19
+        with TileCoverageBitmap.create(self.path, grid, zoom) as bitmap:
+            bitmap.set(3, 4)
+            bitmap.set(93, 62)
+            # A second mapping of the same file sees the changes
+            with TileCoverageBitmap.open(self.path, grid, zoom, readonly=True) as reader:
+                self.assertTrue(reader.test(3, 4))
+                self.assertTrue(reader.test(93, 62))
+                self.assertEqual(reader.count(), 2)
+                with self.assertRaises(TypeError):
+                    reader.set(1, 1)
+
+        bitmap = TileCoverageBitmap(grid, zoom)
+        bitmap.set(1, 2)
+        bitmap.save(self.path)
+        with TileCoverageBitmap.open(self.path, grid, zoom) as reader:
+            self.assertEqual(reader.count(), 1)
+            self.assertTrue(reader.test(1, 2))
+
+    def testTruncated(self):
+        grid = GeoadminTileGridLV95()
+        TileCoverageBitmap.create(self.path, grid, 19).close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        # A leaked file object warns when collected
+        with warnings.catch_warnings(record=True) as leaks:
+            warnings.simplefilter('always', ResourceWarning)
+            with self.assertRaises(AssertionError):
+                TileCoverageBitmap.open(self.path, grid, 19)
+            gc.collect()
+        self.assertEqual(leaks, [])
+
+    def testLockedWriters(self):
+        grid = GeoadminTileGridLV95()
+        zoom = 19
+        TileCoverageBitmap.create(self.path, grid, zoom).close()
+        nbWriters = 8
+
+        def write(writer):
+            # Each writer maps the file and sets its own bit of the same bytes
+            with TileCoverageBitmap.open(self.path, grid, zoom) as bitmap:
+                for col in range(writer, bitmap.nbCols, nbWriters):
+                    with bitmap.lock():
+                        bitmap.set(col, 0)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(nbWriters)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with TileCoverageBitmap.open(self.path, grid, zoom, readonly=True) as bitmap:
+            self.assertEqual(bitmap.count(), bitmap.nbCols)
+
+        bitmap = TileCoverageBitmap(grid, zoom)
+        with bitmap.lock() as locked:
+            self.assertIs(locked, bitmap)
+            locked.set(1, 1)
+        self.assertTrue(bitmap.test(1, 1))
+
+    def testMisalignedGrid(self):
+        grid = GeoadminTileGridLV95()
+        TileCoverageBitmap(grid, 18).save(self.path)
+        with self.assertRaises(AssertionError):
+            TileCoverageBitmap.open(self.path, grid, 19)
+        with self.assertRaises(AssertionError):
+            TileCoverageBitmap.open(self.path, GeoadminTileGridLV03(), 18)
+        with self.assertRaises(AssertionError):
+            TileCoverageBitmap.open(self.path, GeoadminTileGridLV95(originCorner='bottom-left'), 18)
+        extent = [2500000.0, 1100000.0, 2600000.0, 1200000.0]
+        with self.assertRaises(AssertionError):
+            TileCoverageBitmap.open(self.path, GeoadminTileGridLV95(extent=extent), 18)
+
+        extent = [-170.0, 40.0, -169.0, 41.0]
+        geodetic = GlobalGeodeticTileGrid(extent=extent, tmsCompatible=True)
+        TileCoverageBitmap(geodetic, 1).save(self.path)
+        with self.assertRaises(AssertionError):
+            TileCoverageBitmap.open(
+                self.path, GlobalGeodeticTileGrid(extent=extent, tmsCompatible=False), 1
+            )
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def testVectorized(self):
+        grid = GeoadminTileGridLV95()
+        zoom = 21
+        cols = np.array([0, 1, 2, 374, 374, 100])
+        rows = np.array([0, 0, 0, 249, 249, 17])
+        with TileCoverageBitmap.create(self.path, grid, zoom) as bitmap:
+            bitmap.setTiles(cols, rows)
+            self.assertEqual(bitmap.count(), 5)
+            self.assertTrue(all(bitmap.test(int(c), int(r)) for c, r in zip(cols, rows)))
+            tested = bitmap.testTiles([0, 3, 374, 100], [0, 0, 249, 18])
+            self.assertEqual(tested.tolist(), [True, False, True, False])
+            bitmap.setTiles([1, 2], [0, 0], value=False)
+            self.assertEqual(bitmap.count(), 3)
+            self.assertTrue(bitmap.test(0, 0))
+            with self.assertRaises(AssertionError):
+                bitmap.setTiles([375], [0])
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import TileExpiry
+from gatilegrid import TileRangeSet
+from gatilegrid import expireTiles
+
+
+class TestTileExpiry(unittest.TestCase):
+
+    def _randomExtents(self, grid, nb):
+        random.seed(7)
+        extents = []
+        for _ in range(nb):
+            x = random.uniform(grid.MINX - 10000, grid.MAXX)
+            y = random.uniform(grid.MINY - 10000, grid.MAXY)
+            extents.append([x, y, x + random.uniform(1, 20000), y + random.uniform(1, 20000)])
+        return extents
+
+    def testExpiry(self):
+        grid = GeoadminTileGridLV95()
+        extents = self._randomExtents(grid, 300)
+        tileExpiry = TileExpiry(grid, 14, 19, bufferSize=32)
+        tileExpiry.update(iter(extents))
+
+        expected = set()
+        for extent in extents:
+            if not grid.intersectsExtent(extent):
+                continue
+            extent = [
+                max(extent[0], grid.MINX),
+                max(extent[1], grid.MINY),
+                min(extent[2], grid.MAXX),
+                min(extent[3], grid.MAXY)
+            ]
+            for zoom in range(14, 20):
+                [minRow, minCol, maxRow, maxCol] = grid.getExtentAddress(zoom, extent=extent)
+                for col in range(minCol, maxCol + 1):
+                    for row in range(minRow, maxRow + 1):
+                        expected.add((zoom, col, row))
+
+        tiles = list(tileExpiry)
+        self.assertEqual(len(tiles), len(set(tiles)))
+        self.assertEqual(set(tiles), expected)
+        self.assertEqual(len(tileExpiry), len(expected))
+        self.assertEqual([t[0] for t in tiles], sorted(t[0] for t in tiles))
+
+        tileRangeSets = expireTiles(grid, extents, 14, 19)
+        self.assertEqual([z for z, t in tileRangeSets], list(range(14, 20)))
+        for zoom, tileRangeSet in tileRangeSets:
+            self.assertEqual(tileRangeSet, tileExpiry.getTileRangeSet(zoom))
+
+    def testExpiryOutsideAndBorders(self):
+        grid = GeoadminTileGridLV95()
+        self.assertEqual(len(expireTiles(grid, [[0, 0, 10, 10]], 0, 5)[0][1]), 0)
+
+        # Extent aligned on the tiles borders of zoom 16 (64000m tiles)
+        extent = [grid.MINX, grid.MAXY - 128000, grid.MINX + 128000, grid.MAXY]
+        [(zoom, tiles)] = expireTiles(grid, [extent], 16, 16)
+        self.assertEqual(tiles, TileRangeSet.fromExtentAddress(16, [0, 0, 2, 2]))
@@ -1,5 +1,11 @@
 import unittest
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from gatilegrid import TileBounds
 from gatilegrid.grid import Grid
 
 
@@ -350,3 +356,80 @@ class TestGeoadminTileGrid(unittest.TestCase):
         self.assertLess(extentAddress[1], extentAddress_sub[1])
         self.assertGreater(extentAddress[2], extentAddress_sub[2])
         self.assertGreater(extentAddress[3], extentAddress_sub[3])
+
+    def testGridTileTypes(self):
+        grid = Grid([0, 0, 100, 100], 5, -5, useTileTypes=True)
+        cellExtent = grid.cellExtent(1, 2)
+        self.assertIsInstance(cellExtent, TileBounds)
+        self.assertEqual(list(cellExtent), Grid([0, 0, 100, 100], 5, -5).cellExtent(1, 2))
+        self.assertEqual(cellExtent.minX, 5.0)
+        self.assertEqual(cellExtent.maxY, 90.0)
+        cells = set(c[0] for c in grid)
+        self.assertEqual(len(cells), grid.nbCells)
+
+    def testIterBlocks(self):
+        extent = [0, 0, 100, 60]
+        for resolutionX, resolutionY in ((5, 5), (5, -5), (-5, 5), (-5, -5)):
+            grid = Grid(extent, resolutionX, resolutionY)
+            blocks = [b for b in grid.iterBlocks(8, 5)]
+            self.assertEqual(len(blocks), 3 * 3)
+            # row-major: the column offset changes first
+            self.assertEqual([b[:2] for b in blocks[:4]], [(0, 0), (8, 0), (16, 0), (0, 5)])
+            self.assertEqual(blocks[2][2:4], (4, 5))
+            self.assertEqual(blocks[-1][2:4], (4, 2))
+            self.assertEqual(sum(b[2] * b[3] for b in blocks), grid.nbCells)
+
+            for (colOffset, rowOffset, nbCols, nbRows, windowExtent) in blocks:
+                first = grid.cellExtent(colOffset, rowOffset)
+                last = grid.cellExtent(colOffset + nbCols - 1, rowOffset + nbRows - 1)
+                if grid.isLeft:
+                    self.assertEqual(windowExtent[0], first[0])
+                    self.assertEqual(windowExtent[2], last[2])
+                else:
+                    self.assertEqual(windowExtent[0], last[0])
+                    self.assertEqual(windowExtent[2], first[0] - resolutionX)
+                self.assertEqual(windowExtent[1], min(first[1], last[1]))
+                self.assertEqual(windowExtent[3], max(first[3], last[3]))
+
+            blocks = [b for b in grid.iterBlocks(8, 5, order='column-major')]
+            self.assertEqual([b[:2] for b in blocks[:4]], [(0, 0), (0, 5), (0, 10), (8, 0)])
+
+        with self.assertRaises(AssertionError):
+            next(grid.iterBlocks(0, 5))
+        with self.assertRaises(AssertionError):
+            next(grid.iterBlocks(8, 5, order='diagonal'))
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestGridBatch(unittest.TestCase):
+
+    def testCellAddressesFromPointCoordinates(self):
+        extent = [485349.96, 75250.055, 833849.959, 295950.054]
+        xs = np.concatenate([
+            np.linspace(extent[0] - 1000, extent[2] + 1000, 41), [extent[0], extent[2]]
+        ])
+        ys = np.concatenate([
+            np.linspace(extent[1] - 1000, extent[3] + 1000, 41), [extent[1], extent[3]]
+        ])
+        for resolutionX, resolutionY in ((100, 100), (100, -100), (-100, 100), (-100, -100)):
+            grid = Grid(extent, resolutionX, resolutionY)
+            cols, rows, valid = grid.cellAddressesFromPointCoordinates(xs, ys)
+            self.assertEqual(cols.dtype, np.int64)
+            self.assertEqual(valid.dtype, np.bool_)
+            for i, point in enumerate(zip(xs, ys)):
+                [col, row] = grid.cellAddressFromPointCoordinate(list(point))
+                if col is None:
+                    self.assertFalse(valid[i])
+                    self.assertEqual(cols[i], -1)
+                    self.assertEqual(rows[i], -1)
+                else:
+                    self.assertTrue(valid[i])
+                    self.assertEqual(cols[i], col)
+                    self.assertEqual(rows[i], row)
+
+            points = np.column_stack([xs, ys])
+            colsPoints, rowsPoints, validPoints = \
+                grid.cellAddressesFromPointCoordinates(points)
+            self.assertEqual(colsPoints.tolist(), cols.tolist())
+            self.assertEqual(rowsPoints.tolist(), rows.tolist())
+            self.assertEqual(validPoints.tolist(), valid.tolist())
@@ -0,0 +1,110 @@
+import unittest
+
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import Grid
+from gatilegrid import disableInstrumentation
+from gatilegrid import enableInstrumentation
+from gatilegrid import getInstrumentationSnapshot
+from gatilegrid import isInstrumentationEnabled
+from gatilegrid import resetInstrumentation
+from gatilegrid.tilegrids import _TileGrid
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        resetInstrumentation()
+
+    def tearDown(self):
+        disableInstrumentation()
+        resetInstrumentation()
+
+    def testDisabledByDefault(self):
+        self.assertFalse(isInstrumentationEnabled())
+        original = _TileGrid.__dict__['tileAddress']
+        enableInstrumentation()
+        self.assertTrue(isInstrumentationEnabled())
+        self.assertIsNot(_TileGrid.__dict__['tileAddress'], original)
+        disableInstrumentation()
+        self.assertIs(_TileGrid.__dict__['tileAddress'], original)
+        grid = GeoadminTileGridLV95()
+        grid.tileAddress(20, [2600000, 1200000])
+        self.assertEqual(getInstrumentationSnapshot(), {})
+
+    def testCallCounts(self):
+        grid = GeoadminTileGridLV95()
+        enableInstrumentation()
+        point = [2600000, 1200000]
+        self.assertEqual(grid.tileAddress(20, point), [70, 58])
+        grid.tileAddress(20, point)
+        grid.tileAddress(zoom=21, point=point)
+        grid.getClosestZoom(10.0)
+        snapshot = getInstrumentationSnapshot()
+
+        stats = snapshot['GeoadminTileGridLV95.tileAddress']
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['tiles'], 0)
+        self.assertGreater(stats['seconds'], 0)
+        self.assertEqual(stats['zooms'][20]['calls'], 2)
+        self.assertEqual(stats['zooms'][21]['calls'], 1)
+        stats = snapshot['GeoadminTileGridLV95.getClosestZoom']
+        self.assertEqual(stats['calls'], 1)
+        self.assertEqual(stats['zooms'], {})
+
+        # The snapshot is a copy
+        snapshot['GeoadminTileGridLV95.tileAddress']['zooms'][20]['calls'] = 0
+        self.assertEqual(
+            getInstrumentationSnapshot()['GeoadminTileGridLV95.tileAddress']['zooms'][20]['calls'],
+            2
+        )
+        resetInstrumentation()
+        self.assertEqual(getInstrumentationSnapshot(), {})
+
+    def testGenerators(self):
+        grid = GeoadminTileGridLV95()
+        enableInstrumentation()
+        tiles = list(grid.iterGrid(14, 16))
+        stats = getInstrumentationSnapshot()['GeoadminTileGridLV95.iterGrid']
+        self.assertEqual(stats['calls'], 1)
+        self.assertEqual(stats['tiles'], len(tiles))
+        for zoom in range(14, 17):
+            self.assertEqual(stats['zooms'][zoom]['calls'], 1)
+            self.assertEqual(stats['zooms'][zoom]['tiles'], grid.numberOfTilesAtZoom(zoom))
+
+        # Stopping early records the yielded tiles
+        for i, tile in enumerate(grid.iterGrid(17, 18)):
+            if i == 9:
+                break
+        stats = getInstrumentationSnapshot()['GeoadminTileGridLV95.iterGrid']
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['zooms'][17]['tiles'], 10)
+
+        cellGrid = Grid([0, 0, 100, 50], 10, -10)
+        self.assertEqual(len(list(cellGrid)), 50)
+        list(cellGrid.iterBlocks(3, 3))
+        snapshot = getInstrumentationSnapshot()
+        self.assertEqual(snapshot['Grid.__iter__']['tiles'], 50)
+        self.assertEqual(snapshot['Grid.iterBlocks']['tiles'], 50)
+        self.assertEqual(snapshot['Grid.cellExtent']['calls'], 50)
+
+    def testCallback(self):
+        grid = GeoadminTileGridLV95()
+        grid.precompute()
+        records = []
+        enableInstrumentation(lambda *args: records.append(args))
+        grid.tileBounds(17, 1, 2)
+        list(grid.iterGrid(0, 1))
+        names = ('GeoadminTileGridLV95.tileBounds', 'GeoadminTileGridLV95.iterGrid')
+        self.assertEqual([(r[0], r[1], r[3]) for r in records if r[0] in names], [
+            ('GeoadminTileGridLV95.tileBounds', 17, 0),
+            ('GeoadminTileGridLV95.iterGrid', 0, 1),
+            ('GeoadminTileGridLV95.iterGrid', 1, 1),
+        ])
+        # Nested calls are recorded too
+        grid.getExtentAddress(15)
+        self.assertIn('GeoadminTileGridLV95.tileAddress', [r[0] for r in records])
+
+        nbRecords = len(records)
+        disableInstrumentation()
+        grid.tileBounds(17, 1, 2)
+        self.assertEqual(len(records), nbRecords)
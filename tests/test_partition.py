@@ -0,0 +1,82 @@
+import functools
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import GlobalMercatorTileGrid
+from gatilegrid import TileShard
+from gatilegrid import getTileGridInstance
+from gatilegrid import planShards
+from gatilegrid import runShards
+
+
+def countTiles(shard):
+    tileGrid = getTileGridInstance(2056)
+    return sum(1 for tile in shard.iterTiles(tileGrid))
+
+
+def markShard(directory, shard):
+    time.sleep(0.05)
+    open(os.path.join(directory, str(shard.index)), 'w').close()
+    return shard.index
+
+
+class TestPartition(unittest.TestCase):
+
+    def testPlanShards(self):
+        for grid in (GeoadminTileGridLV95(), GlobalMercatorTileGrid()):
+            tiles = list(grid.iterGrid(0, 12))
+            for nbShards in (1, 3, 8, 13, 64):
+                shards = planShards(grid, 0, 12, nbShards)
+                self.assertEqual([s.index for s in shards], list(range(0, nbShards)))
+                nbTiles = [s.nbTiles for s in shards]
+                self.assertEqual(sum(nbTiles), len(tiles))
+                self.assertLessEqual(max(nbTiles) - min(nbTiles), 1)
+                shardTiles = [t for s in shards for t in s.iterTiles(grid)]
+                self.assertEqual(shardTiles, tiles)
+                for shard in shards:
+                    zooms = [r[0] for r in shard.rectangles]
+                    for zoom in set(zooms):
+                        self.assertLessEqual(zooms.count(zoom), 3)
+
+    def testPlanShardsSingleZoom(self):
+        grid = GeoadminTileGridLV95()
+        shards = planShards(grid, 0, 0, 4)
+        self.assertEqual([s.nbTiles for s in shards], [0, 0, 0, 1])
+        self.assertEqual(shards[3].rectangles, ((0, 0, 0, 0, 0),))
+        shards = planShards(grid, 17, 17, 2)
+        [minRow, minCol, maxRow, maxCol] = grid.getExtentAddress(17)
+        self.assertEqual(shards[0].rectangles[0][:3], (17, minRow, minCol))
+        self.assertEqual(shards[-1].rectangles[-1][3:], (maxRow, maxCol))
+
+    def testPickle(self):
+        grid = GeoadminTileGridLV95()
+        shards = planShards(grid, 20, 24, 4, shardsPerWorker=4)
+        self.assertEqual(len(shards), 16)
+        shard = shards[5]
+        self.assertIsInstance(shard, TileShard)
+        self.assertEqual(pickle.loads(pickle.dumps(shard)), shard)
+        self.assertLess(len(pickle.dumps(shard)), 300)
+
+    def testRunShards(self):
+        grid = getTileGridInstance(2056)
+        shards = planShards(grid, 10, 16, 5)
+        results = list(runShards(countTiles, shards, maxWorkers=2))
+        self.assertEqual(sorted(s.index for s, r in results), list(range(0, 5)))
+        for shard, nbTiles in results:
+            self.assertEqual(nbTiles, shard.nbTiles)
+        results = list(runShards(countTiles, shards, maxWorkers=2, ordered=True))
+        self.assertEqual([s for s, r in results], shards)
+
+    def testRunShardsStopped(self):
+        shards = planShards(GeoadminTileGridLV95(), 10, 16, 40)
+        for ordered in (False, True):
+            with tempfile.TemporaryDirectory() as directory:
+                func = functools.partial(markShard, directory)
+                for shard, result in runShards(func, shards, maxWorkers=1, ordered=ordered):
+                    break
+                # The pending shards are cancelled, not run on exit
+                self.assertLess(len(os.listdir(directory)), len(shards))
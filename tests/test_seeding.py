@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from gatilegrid import ChunkLease
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import SeedingQueue
+
+
+class TestSeedingQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.grid = GeoadminTileGridLV95()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _queue(self, owner, leaseTimeout=600.0):
+        return SeedingQueue(
+            self.grid, 10, 17, self.directory, chunkSize=100, leaseTimeout=leaseTimeout, owner=owner
+        )
+
+    def testSeedAll(self):
+        queue = self._queue('a')
+        nbTiles = self.grid.totalNumberOfTiles(10, 17)
+        self.assertEqual(queue.nbChunks, (nbTiles + 99) // 100)
+        tiles = []
+        for lease in queue:
+            self.assertIsInstance(lease, ChunkLease)
+            tiles.extend(lease.shard.iterTiles(self.grid))
+            queue.complete(lease)
+        self.assertEqual(tiles, list(self.grid.iterGrid(10, 17)))
+        progress = queue.progress()
+        self.assertEqual(progress['nbDone'], queue.nbChunks)
+        self.assertEqual(progress['nbTilesDone'], nbTiles)
+        self.assertEqual(progress['nbPending'] + progress['nbLeased'], 0)
+        self.assertIsNone(queue.acquire())
+        self.assertEqual(os.listdir(os.path.join(self.directory, 'leases')), [])
+
+    def testDoneChunksNotProbed(self):
+        queue = self._queue('a')
+        for lease in queue:
+            queue.complete(lease)
+        # Another worker completes the chunks of a fresh queue
+        other = self._queue('b')
+        with mock.patch('os.path.exists', wraps=os.path.exists) as exists:
+            self.assertIsNone(queue.acquire())
+            self.assertEqual(exists.call_count, 0)
+            self.assertIsNone(other.acquire())
+            self.assertEqual(exists.call_count, queue.nbChunks)
+            self.assertIsNone(other.acquire())
+            self.assertEqual(exists.call_count, queue.nbChunks)
+
+    def testSeveralWorkersAndResume(self):
+        queueA = self._queue('a')
+        queueB = self._queue('b')
+        leaseA = queueA.acquire()
+        leaseB = queueB.acquire()
+        self.assertEqual((leaseA.shard.index, leaseB.shard.index), (0, 1))
+        queueA.complete(leaseA)
+        self.assertEqual(queueA.progress()['nbLeased'], 1)
+
+        # Restarting a worker skips the done and the leased chunks
+        queueC = self._queue('c')
+        self.assertEqual(queueC.acquire().shard.index, 2)
+        self.assertTrue(queueC.isDone(0))
+
+        queueB.release(leaseB)
+        self.assertEqual(queueC.acquire().shard.index, 1)
+
+    def testExpiredLease(self):
+        queueA = self._queue('a', leaseTimeout=0.0)
+        queueB = self._queue('b')
+        leaseA = queueA.acquire()
+        time.sleep(0.01)
+        self.assertEqual(queueB.progress()['nbExpired'], 1)
+        leaseB = queueB.acquire()
+        self.assertEqual(leaseB.shard.index, leaseA.shard.index)
+        self.assertEqual(leaseB.owner, 'b')
+        # The lost lease can not be renewed or released
+        self.assertFalse(queueA.ownsLease(leaseA))
+        self.assertIsNone(queueA.renew(leaseA))
+        queueA.release(leaseA)
+        self.assertTrue(queueB.ownsLease(leaseB))
+        renewed = queueB.renew(leaseB)
+        self.assertGreaterEqual(renewed.expires, leaseB.expires)
+        queueB.complete(renewed)
+        self.assertTrue(queueA.isDone(leaseA.shard.index))
+
+    def testManifest(self):
+        self._queue('a')
+        with self.assertRaises(AssertionError):
+            SeedingQueue(self.grid, 10, 18, self.directory, chunkSize=100)
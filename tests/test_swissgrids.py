@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from gatilegrid import GeoadminTileGridLV03
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import swissGridOffset
+from gatilegrid import swissTileAlignment
+from gatilegrid import translateBounds
+from gatilegrid import translateExtentAddresses
+from gatilegrid import translateTileAddresses
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestSwissGrids(unittest.TestCase):
+
+    def _randomTiles(self, grid, zoom, nb):
+        random.seed(zoom)
+        [minRow, minCol, maxRow, maxCol] = grid.getExtentAddress(zoom)
+        cols = [random.randint(minCol, maxCol) for _ in range(nb)]
+        rows = [random.randint(minRow, maxRow) for _ in range(nb)]
+        return cols, rows
+
+    def testOffset(self):
+        lv03 = GeoadminTileGridLV03()
+        lv95 = GeoadminTileGridLV95()
+        self.assertEqual(swissGridOffset(lv03, lv95), (2000000.0, 1000000.0))
+        self.assertEqual(swissGridOffset(lv95, lv03), (-2000000.0, -1000000.0))
+        with self.assertRaises(AssertionError):
+            swissGridOffset(lv03, lv03)
+        bounds = translateBounds(lv03, lv95, [lv03.tileBounds(20, 3, 4), lv03.extent])
+        self.assertEqual(bounds[0].tolist(), lv95.tileBounds(20, 3, 4))
+        self.assertEqual(bounds[1].tolist(), lv95.extent)
+        self.assertEqual(translateBounds(lv95, lv03, bounds).tolist()[1], lv03.extent)
+
+    def testAligned(self):
+        lv03 = GeoadminTileGridLV03()
+        lv95 = GeoadminTileGridLV95()
+        for zoom in range(0, len(lv03.RESOLUTIONS)):
+            self.assertEqual(swissTileAlignment(lv03, lv95, zoom), ((0, 1), (0, 1)))
+            cols, rows = self._randomTiles(lv03, zoom, 50)
+            ranges = translateTileAddresses(lv03, lv95, zoom, cols, rows)
+            self.assertEqual(ranges.dtype, np.int64)
+            self.assertEqual(ranges.tolist(), [[r, c, r, c] for c, r in zip(cols, rows)])
+            ranges = translateTileAddresses(lv95, lv03, zoom, cols, rows)
+            self.assertEqual(ranges[:, 1].tolist(), cols)
+
+        extentAddress = lv03.getExtentAddress(22, extent=[600000, 200000, 610000, 205000])
+        self.assertEqual(
+            translateExtentAddresses(lv03, lv95, 22, [extentAddress]).tolist(),
+            [lv95.getExtentAddress(22, extent=[2600000, 1200000, 2610000, 1205000])]
+        )
+
+    def _checkCover(self, fromGrid, toGrid, zoom, cols, rows, ranges):
+        [dx, dy] = swissGridOffset(fromGrid, toGrid)
+        for col, row, [minRow, minCol, maxRow, maxCol] in zip(cols, rows, ranges.tolist()):
+            [minX, minY, maxX, maxY] = fromGrid.tileBounds(zoom, col, row)
+            [minX, minY, maxX, maxY] = [minX + dx, minY + dy, maxX + dx, maxY + dy]
+            corners = toGrid.tileBounds(zoom, minCol, minRow) + \
+                toGrid.tileBounds(zoom, maxCol, maxRow)
+            # The target range covers the tile
+            self.assertLessEqual(min(corners[0::2]), minX + 1e-6)
+            self.assertGreaterEqual(max(corners[0::2]), maxX - 1e-6)
+            self.assertLessEqual(min(corners[1::2]), minY + 1e-6)
+            self.assertGreaterEqual(max(corners[1::2]), maxY - 1e-6)
+            # And its border tiles overlap the tile
+            for [tMinX, tMinY, tMaxX, tMaxY] in (corners[:4], corners[4:]):
+                self.assertTrue(tMinX < maxX - 1e-6 and tMaxX > minX + 1e-6)
+                self.assertTrue(tMinY < maxY - 1e-6 and tMaxY > minY + 1e-6)
+
+    def testRangeMapping(self):
+        lv03 = GeoadminTileGridLV03()
+        grids = (
+            GeoadminTileGridLV95(originCorner='bottom-left'),
+            GeoadminTileGridLV95(tileSizePx=512.0),
+            GeoadminTileGridLV95(tileSizePx=300.0, originCorner='bottom-left'),
+        )
+        for lv95 in grids:
+            for zoom in (0, 10, 17, 22, 26):
+                cols, rows = self._randomTiles(lv03, zoom, 30)
+                ranges = translateTileAddresses(lv03, lv95, zoom, cols, rows)
+                self._checkCover(lv03, lv95, zoom, cols, rows, ranges)
+
+        # Different origin corners align where the tile size divides the height
+        lv95 = grids[0]
+        alignment = swissTileAlignment(lv03, lv95, 26)
+        self.assertEqual(alignment, ((0, 1), (320000 // 128, -1)))
+        self.assertEqual(translateTileAddresses(lv03, lv95, 26, [5], [0]).tolist(),
+                         [[2499, 5, 2499, 5]])
+        self.assertIsNone(swissTileAlignment(lv03, lv95, 0))
+        self.assertIsNone(swissTileAlignment(lv03, grids[1], 20))
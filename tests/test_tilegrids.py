@@ -1,11 +1,22 @@
+import asyncio
 import math
 import unittest
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from gatilegrid import GeoadminTileGridLV03
 from gatilegrid import GeoadminTileGridLV95
 from gatilegrid import GlobalGeodeticTileGrid
 from gatilegrid import GlobalMercatorTileGrid
+from gatilegrid import TileAddress
+from gatilegrid import TileBounds
+from gatilegrid import clearTileGridCache
 from gatilegrid import getTileGrid
+from gatilegrid import getTileGridCacheInfo
+from gatilegrid import getTileGridInstance
 
 
 class TestGeoadminTileGrid(unittest.TestCase):
@@ -667,3 +678,679 @@ class TestGeoadminTileGrid(unittest.TestCase):
         # Check that the tile intersects 4 parent tiles
         z, x, y = [25, 700, 580]
         self.assertEqual(len(grid.getParentTiles(z, x, y, 24)), 4)
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestTileGridBatch(unittest.TestCase):
+
+    def testTileAddresses(self):
+        for originCorner in ('top-left', 'bottom-left'):
+            for grid in (
+                GeoadminTileGridLV03(originCorner=originCorner),
+                GeoadminTileGridLV95(originCorner=originCorner),
+                GlobalMercatorTileGrid(originCorner=originCorner, useSwissExtent=False),
+                GlobalGeodeticTileGrid(originCorner=originCorner, useSwissExtent=False)
+            ):
+                xs = np.linspace(grid.MINX, grid.MAXX, 37)
+                ys = np.linspace(grid.MINY, grid.MAXY, 37)
+                for zoom in (0, 5, 17):
+                    addresses = grid.tileAddresses(zoom, xs, ys)
+                    self.assertEqual(addresses.shape, (37, 2))
+                    for i, point in enumerate(zip(xs, ys)):
+                        self.assertEqual(
+                            addresses[i].tolist(), grid.tileAddress(zoom, list(point))
+                        )
+                    points = np.column_stack([xs, ys])
+                    self.assertEqual(
+                        grid.tileAddresses(zoom, points).tolist(), addresses.tolist()
+                    )
+
+    def testTileAddressesEdges(self):
+        grid = GeoadminTileGridLV03()
+        points = [[grid.MINX, grid.MAXY], [grid.MAXX, grid.MINY], [grid.MAXX, grid.MAXY]]
+        addresses = grid.tileAddresses(17, points)
+        self.assertEqual(addresses.tolist(), [grid.tileAddress(17, p) for p in points])
+
+        with self.assertRaises(AssertionError):
+            grid.tileAddresses(17, [[grid.MINX - 1, grid.MAXY]])
+        with self.assertRaises(AssertionError):
+            grid.tileAddresses(40, [[grid.MINX, grid.MAXY]])
+
+    def testTileBoundsArray(self):
+        for originCorner in ('top-left', 'bottom-left'):
+            for grid in (
+                GeoadminTileGridLV95(originCorner=originCorner),
+                GlobalMercatorTileGrid(originCorner=originCorner, useSwissExtent=False),
+                GlobalGeodeticTileGrid(originCorner=originCorner, useSwissExtent=False)
+            ):
+                zoom = 8
+                [minRow, minCol, maxRow, maxCol] = grid.getExtentAddress(zoom)
+                cols, rows = np.meshgrid(
+                    np.arange(minCol, maxCol + 1), np.arange(minRow, maxRow + 1)
+                )
+                bounds = grid.tileBoundsArray(zoom, cols, rows)
+                self.assertEqual(bounds.dtype, np.float64)
+                self.assertTrue(bounds.flags['C_CONTIGUOUS'])
+                self.assertEqual(bounds.shape, (cols.size, 4))
+                for i, (col, row) in enumerate(zip(cols.ravel(), rows.ravel())):
+                    self.assertEqual(
+                        bounds[i].tolist(), grid.tileBounds(zoom, int(col), int(row))
+                    )
+
+        grid = GeoadminTileGridLV03()
+        with self.assertRaises(AssertionError):
+            grid.tileBoundsArray(77, [5], [5])
+        with self.assertRaises(AssertionError):
+            grid.tileBoundsArray(17, [5, 6], [5])
+
+    def testIterGridBlocks(self):
+        offset = 20000.0
+        extent = [
+            GeoadminTileGridLV03.MINX + offset,
+            GeoadminTileGridLV03.MINY + offset,
+            GeoadminTileGridLV03.MAXX - offset,
+            GeoadminTileGridLV03.MAXY - offset
+        ]
+        for originCorner in ('top-left', 'bottom-left'):
+            grid = GeoadminTileGridLV03(extent=extent, originCorner=originCorner)
+            tilesSpec = [t for t in grid.iterGrid(13, 19)]
+            blocks = [b for b in grid.iterGridBlocks(13, 19, blockSize=7)]
+            self.assertTrue(all(len(b[2]) <= 7 for b in blocks))
+            tilesSpecBlocks = []
+            for (bounds, zoom, cols, rows) in blocks:
+                self.assertEqual(bounds.shape, (len(cols), 4))
+                for i, col in enumerate(cols):
+                    tilesSpecBlocks.append((bounds[i].tolist(), zoom, int(col), int(rows[i])))
+            self.assertEqual(tilesSpecBlocks, tilesSpec)
+
+        with self.assertRaises(AssertionError):
+            next(grid.iterGridBlocks(13, 11))
+        with self.assertRaises(AssertionError):
+            next(grid.iterGridBlocks(13, 14, blockSize=0))
+
+
+class TestTileGridZoomTable(unittest.TestCase):
+
+    def testZoomTable(self):
+        grid = GeoadminTileGridLV95()
+        zoomTable = grid.zoomTable
+        self.assertIs(zoomTable, grid.zoomTable)
+        self.assertEqual(len(zoomTable), len(grid.RESOLUTIONS))
+        cumulativeNbTiles = 0
+        for zoom, entry in enumerate(zoomTable):
+            [minRow, minCol, maxRow, maxCol] = grid.getExtentAddress(zoom)
+            self.assertEqual(entry['extentAddress'], [minRow, minCol, maxRow, maxCol])
+            self.assertEqual(entry['nbTilesX'], maxCol - minCol + 1)
+            self.assertEqual(entry['nbTilesY'], maxRow - minRow + 1)
+            self.assertEqual(entry['nbTiles'], entry['nbTilesX'] * entry['nbTilesY'])
+            cumulativeNbTiles += entry['nbTiles']
+            self.assertEqual(entry['cumulativeNbTiles'], cumulativeNbTiles)
+            self.assertEqual(entry['tileSize'], grid.tileSize(zoom))
+
+    def testInvalidatedOnAssignment(self):
+        grid = GeoadminTileGridLV95()
+        self.assertEqual(grid.numberOfTilesAtZoom(15), 12)
+        grid.precompute()
+        grid.extent = [2600000.0, 1200000.0, 2610000.0, 1210000.0]
+        self.assertEqual(grid.zoomTable[15]['extentAddress'], grid.getExtentAddress(15))
+        self.assertEqual(grid.numberOfTilesAtZoom(15), 1)
+        self.assertEqual(len(list(grid.iterGrid(15, 15))), 1)
+
+        grid.tileSizePx = 512.0
+        self.assertEqual(grid.tileSizeUnchecked(10), 512.0 * grid.RESOLUTIONS[10])
+        self.assertEqual(grid.zoomTable[10]['tileSize'], grid.tileSize(10))
+
+        geodetic = GlobalGeodeticTileGrid(tmsCompatible=True, useSwissExtent=False)
+        self.assertEqual(geodetic.numberOfTilesAtZoom(0), 2)
+        geodetic.RESOLUTIONS = GlobalGeodeticTileGrid(tmsCompatible=False).RESOLUTIONS
+        self.assertEqual(geodetic.numberOfTilesAtZoom(0), 1)
+        self.assertEqual(geodetic.tileSize(0), 360.0)
+
+    def testTotalNumberOfTilesRanges(self):
+        grid = GlobalGeodeticTileGrid(tmsCompatible=False, useSwissExtent=False)
+        self.assertEqual(grid.totalNumberOfTiles(0, 3), 1 + 2 + 8 + 32)
+        self.assertEqual(grid.totalNumberOfTiles(2, 3), 8 + 32)
+        self.assertEqual(grid.totalNumberOfTiles(3, 3), 32)
+        self.assertEqual(
+            grid.totalNumberOfTiles(),
+            sum(grid.numberOfTilesAtZoom(z) for z in range(0, len(grid.RESOLUTIONS)))
+        )
+
+        with self.assertRaises(AssertionError):
+            grid.numberOfTilesAtZoom(-1)
+        with self.assertRaises(AssertionError):
+            grid.numberOfXTilesAtZoom(40)
+        with self.assertRaises(AssertionError):
+            grid.totalNumberOfTiles(0, 40)
+
+
+class TestTileGridUnchecked(unittest.TestCase):
+
+    def testUncheckedMatchesChecked(self):
+        for originCorner in ('top-left', 'bottom-left'):
+            for grid in (
+                GeoadminTileGridLV03(originCorner=originCorner),
+                GlobalMercatorTileGrid(originCorner=originCorner, useSwissExtent=False),
+                GlobalGeodeticTileGrid(originCorner=originCorner, useSwissExtent=False)
+            ):
+                points = [
+                    [grid.MINX, grid.MINY],
+                    [grid.MAXX, grid.MAXY],
+                    [grid.MINX, grid.MAXY],
+                    [grid.MINX + grid.XSPAN / 3.0, grid.MINY + grid.YSPAN / 7.0],
+                ]
+                for zoom in range(0, len(grid.RESOLUTIONS), 3):
+                    self.assertEqual(grid.tileSizeUnchecked(zoom), grid.tileSize(zoom))
+                    self.assertEqual(
+                        grid.tileBoundsUnchecked(zoom, 3, 2), grid.tileBounds(zoom, 3, 2)
+                    )
+                    for point in points:
+                        self.assertEqual(
+                            grid.tileAddressUnchecked(zoom, point),
+                            grid.tileAddress(zoom, point)
+                        )
+
+
+class TestTileGridTileTypes(unittest.TestCase):
+
+    def testTileTypes(self):
+        grid = GeoadminTileGridLV95()
+        gridTypes = GeoadminTileGridLV95(useTileTypes=True)
+        self.assertFalse(grid.useTileTypes)
+
+        bounds = gridTypes.tileBounds(17, 5, 5)
+        self.assertIsInstance(bounds, TileBounds)
+        self.assertEqual(list(bounds), grid.tileBounds(17, 5, 5))
+        self.assertEqual(bounds.minX, bounds[0])
+        self.assertEqual(bounds.maxY, bounds[3])
+        self.assertIsInstance(gridTypes.tileBoundsUnchecked(17, 5, 5), TileBounds)
+        with self.assertRaises(AttributeError):
+            bounds.minX = 0.0
+        with self.assertRaises(AttributeError):
+            bounds.foo = 0.0
+
+        for (tileBounds, zoom, col, row) in gridTypes.iterGrid(0, 2):
+            self.assertIsInstance(tileBounds, TileBounds)
+
+        z, x, y = [25, 700, 580]
+        addresses = gridTypes.getParentTiles(z, x, y, 24)
+        self.assertEqual(len(addresses), 4)
+        self.assertTrue(all(isinstance(a, TileAddress) for a in addresses))
+        self.assertEqual([list(a) for a in addresses], grid.getParentTiles(z, x, y, 24))
+        self.assertEqual(addresses[0].zoom, 24)
+        self.assertEqual(gridTypes.getParentTiles(z, x, y, z), [TileAddress(z, x, y)])
+
+        tileSet = set(addresses)
+        tileSet.update(gridTypes.getParentTiles(z, x, y, 24))
+        self.assertEqual(len(tileSet), 4)
+        self.assertIn(TileAddress(*addresses[0]), tileSet)
+
+
+class TestTileGridPolygon(unittest.TestCase):
+
+    def _toCoords(self, grid, zoom, ring):
+        "Tile space to grid coordinates"
+        tileSize = grid.tileSize(zoom)
+        if grid.originCorner == 'top-left':
+            return [[grid.MINX + u * tileSize, grid.MAXY - v * tileSize] for u, v in ring]
+        return [[grid.MINX + u * tileSize, grid.MINY + v * tileSize] for u, v in ring]
+
+    def testPolygonRectangle(self):
+        grid = GeoadminTileGridLV95()
+        extent = [2600000.0, 1200000.0, 2700000.0, 1250000.0]
+        ring = [[2600000, 1200000], [2700000, 1200000], [2700000, 1250000], [2600000, 1250000]]
+        for zoom in (10, 16, 18):
+            [minRow, minCol, maxRow, maxCol] = grid.getExtentAddress(
+                zoom, extent=extent, contained=True
+            )
+            ranges = grid.getPolygonAddressRanges(zoom, ring)
+            self.assertEqual(ranges, [[r, minCol, maxCol] for r in range(minRow, maxRow + 1)])
+            self.assertEqual(
+                grid.numberOfTilesInPolygon([ring], zoom),
+                (maxRow - minRow + 1) * (maxCol - minCol + 1)
+            )
+
+    def testPolygonDiamond(self):
+        for originCorner in ('top-left', 'bottom-left'):
+            grid = GlobalMercatorTileGrid(originCorner=originCorner, useSwissExtent=False)
+            zoom = 4
+            diamond = self._toCoords(
+                grid, zoom, [[2.5, 0.5], [4.5, 2.5], [2.5, 4.5], [0.5, 2.5]]
+            )
+            self.assertEqual(
+                grid.getPolygonAddressRanges(zoom, diamond),
+                [[0, 2, 2], [1, 1, 3], [2, 0, 4], [3, 1, 3], [4, 2, 2]]
+            )
+            # Only touches the tile borders at its vertices
+            diamond = self._toCoords(grid, zoom, [[2, 1], [3, 2], [2, 3], [1, 2]])
+            self.assertEqual(grid.getPolygonAddressRanges(zoom, diamond), [[1, 1, 2], [2, 1, 2]])
+
+    def testPolygonHoleAndMultiPolygon(self):
+        grid = GlobalMercatorTileGrid(useSwissExtent=False)
+        zoom = 5
+        exterior = self._toCoords(grid, zoom, [[0, 0], [6, 0], [6, 6], [0, 6]])
+        hole = self._toCoords(grid, zoom, [[2, 2], [4, 2], [4, 4], [2, 4]])
+        ranges = grid.getPolygonAddressRanges(zoom, [exterior, hole])
+        self.assertEqual(ranges[2], [2, 0, 1])
+        self.assertEqual(ranges[3], [2, 4, 5])
+        self.assertEqual(grid.numberOfTilesInPolygon([exterior, hole], zoom), 36 - 4)
+
+        other = self._toCoords(grid, zoom, [[10, 10], [11, 10], [11, 11], [10, 11]])
+        multiPolygon = [[exterior, hole], [other]]
+        self.assertEqual(grid.numberOfTilesInPolygon(multiPolygon, zoom), 36 - 4 + 1)
+        tiles = [t for t in grid.iterPolygon(multiPolygon, zoom, zoom + 1)]
+        self.assertEqual(
+            len(tiles),
+            grid.numberOfTilesInPolygon(multiPolygon, zoom) +
+            grid.numberOfTilesInPolygon(multiPolygon, zoom + 1)
+        )
+        self.assertEqual(tiles[-1][1:], (zoom + 1, 21, 21))
+        self.assertEqual(tiles[-1][0], grid.tileBounds(zoom + 1, 21, 21))
+
+    def testPolygonClippedToExtent(self):
+        grid = GeoadminTileGridLV03()
+        world = [[0, 0], [1000000, 0], [1000000, 400000], [0, 400000]]
+        for zoom in (0, 12, 17):
+            self.assertEqual(
+                grid.numberOfTilesInPolygon(world, zoom), grid.numberOfTilesAtZoom(zoom)
+            )
+        with self.assertRaises(AssertionError):
+            grid.getPolygonAddressRanges(40, world)
+        with self.assertRaises(AssertionError):
+            grid.getPolygonAddressRanges(10, [[[[[0, 0]]]]])
+
+
+class TestTileGridMorton(unittest.TestCase):
+
+    def testIsRegular(self):
+        self.assertFalse(GeoadminTileGridLV03().isRegular)
+        self.assertFalse(GeoadminTileGridLV95().isRegular)
+        self.assertTrue(GlobalMercatorTileGrid().isRegular)
+        self.assertTrue(GlobalGeodeticTileGrid(tmsCompatible=False).isRegular)
+        self.assertTrue(GlobalGeodeticTileGrid(tmsCompatible=True).isRegular)
+        # Computed once, again if the resolutions change
+        grid = GlobalMercatorTileGrid()
+        self.assertTrue(grid.isRegular)
+        self.assertTrue(grid._isRegular)
+        grid.RESOLUTIONS = GeoadminTileGridLV95.RESOLUTIONS
+        self.assertFalse(grid.isRegular)
+
+    def testMortonKey(self):
+        grid = GlobalMercatorTileGrid(useSwissExtent=False)
+        self.assertEqual(grid.mortonKey(0, 0, 0), 0)
+        # Z-order within a zoom level
+        keys = [grid.mortonKey(1, c, r) for (c, r) in ((0, 0), (1, 0), (0, 1), (1, 1))]
+        self.assertEqual(keys, sorted(keys))
+        # Zoom levels don't overlap
+        self.assertLess(grid.mortonKey(2, 3, 3), grid.mortonKey(3, 0, 0))
+        for tile in ([8, 135, 91], [23, 8388607, 4194304], [0, 0, 0]):
+            self.assertEqual(grid.tileFromMortonKey(grid.mortonKey(*tile)), tile)
+
+        with self.assertRaises(AssertionError):
+            GeoadminTileGridLV95().mortonKey(8, 1, 1)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def testMortonKeys(self):
+        grid = GlobalGeodeticTileGrid(useSwissExtent=False)
+        cols = np.array([0, 1, 268, 2**25 - 1])
+        rows = np.array([0, 1, 60, 2**24 - 1])
+        keys = grid.mortonKeys(24, cols, rows)
+        self.assertEqual(keys.dtype, np.uint64)
+        self.assertEqual(
+            keys.tolist(), [grid.mortonKey(24, int(c), int(r)) for c, r in zip(cols, rows)]
+        )
+        zooms, colsDecoded, rowsDecoded = grid.tilesFromMortonKeys(keys)
+        self.assertEqual(zooms.tolist(), [24] * 4)
+        self.assertEqual(colsDecoded.tolist(), cols.tolist())
+        self.assertEqual(rowsDecoded.tolist(), rows.tolist())
+
+    def testQuadKey(self):
+        grid = GlobalMercatorTileGrid(useSwissExtent=False)
+        self.assertEqual(grid.quadKey(3, 3, 5), '213')
+        self.assertEqual(grid.quadKey(0, 0, 0), '')
+        self.assertEqual(grid.tileFromQuadKey('213'), [3, 3, 5])
+        self.assertEqual(grid.tileFromQuadKey(grid.quadKey(8, 135, 91)), [8, 135, 91])
+        with self.assertRaises(AssertionError):
+            grid.quadKey(1, 2, 0)
+        with self.assertRaises(AssertionError):
+            grid.tileFromQuadKey('0124')
+
+    def testIterGridZOrder(self):
+        grid = GlobalMercatorTileGrid()
+        tilesSpec = [t for t in grid.iterGrid(3, 9)]
+        tilesSpecZ = [t for t in grid.iterGrid(3, 9, order='z-order')]
+        self.assertEqual(sorted(tilesSpecZ, key=lambda t: t[1:]),
+                         sorted(tilesSpec, key=lambda t: t[1:]))
+        keys = [grid.mortonKey(z, c, r) for (b, z, c, r) in tilesSpecZ]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(tilesSpecZ[0][0], grid.tileBounds(*tilesSpecZ[0][1:]))
+
+        # Irregular grids can be traversed in Z-order as well
+        grid = GeoadminTileGridLV03()
+        self.assertEqual(
+            sorted(t[1:] for t in grid.iterGrid(16, 18, order='z-order')),
+            sorted(t[1:] for t in grid.iterGrid(16, 18))
+        )
+        with self.assertRaises(AssertionError):
+            next(grid.iterGrid(16, 18, order='random'))
+
+
+class TestTileGridHilbert(unittest.TestCase):
+
+    def testIterGridHilbert(self):
+        for grid, minZoom, maxZoom in (
+            (GeoadminTileGridLV03(), 14, 19),
+            (GeoadminTileGridLV95(originCorner='bottom-left'), 14, 19),
+            (GlobalMercatorTileGrid(), 6, 11)
+        ):
+            tilesSpec = [t for t in grid.iterGrid(minZoom, maxZoom)]
+            tilesSpecHilbert = [t for t in grid.iterGrid(minZoom, maxZoom, order='hilbert')]
+            self.assertEqual(
+                sorted(tilesSpecHilbert, key=lambda t: t[1:]),
+                sorted(tilesSpec, key=lambda t: t[1:])
+            )
+            # Zoom levels are still yielded one after the other
+            self.assertEqual([t[1] for t in tilesSpecHilbert], [t[1] for t in tilesSpec])
+            for (b, z, c, r) in tilesSpecHilbert[:10]:
+                self.assertEqual(b, grid.tileBounds(z, c, r))
+
+            # Consecutive tiles are neighbours, with at most one diagonal step per zoom
+            for zoom in range(minZoom, maxZoom + 1):
+                tiles = [t[2:] for t in tilesSpecHilbert if t[1] == zoom]
+                steps = [
+                    (abs(a[0] - b[0]), abs(a[1] - b[1])) for a, b in zip(tiles, tiles[1:])
+                ]
+                self.assertTrue(all(max(s) == 1 for s in steps))
+                self.assertLessEqual(len([s for s in steps if s == (1, 1)]), 1)
+
+
+class TestTileGridParentChild(unittest.TestCase):
+
+    def testParentsAndChildrenLV95(self):
+        grid = GeoadminTileGridLV95()
+        # 650m -> 500m, 13 child tiles for 10 parent tiles
+        self.assertEqual(grid._zoomRatio(14, 15), (13, 10))
+        self.assertEqual(grid._zoomRatio(28, 0), (1, 40000))
+        self.assertEqual(grid.getParentTiles(15, 0, 0, 14), [[14, 0, 0]])
+        self.assertEqual(
+            grid.getParentTiles(15, 1, 1, 14), [[14, 0, 0], [14, 0, 1], [14, 1, 0], [14, 1, 1]]
+        )
+        self.assertEqual(
+            grid.getChildTiles(14, 0, 0, 15), [[15, 0, 0], [15, 0, 1], [15, 1, 0], [15, 1, 1]]
+        )
+        self.assertEqual(grid.getChildTiles(14, 2, 1, 14), [[14, 2, 1]])
+        self.assertEqual(grid.getChildTiles(14, 2, 2, 14), [])
+        children = grid.getChildTiles(16, 2, 2, 18)
+        self.assertEqual(len(children), 5 * 5)
+        for child in children:
+            self.assertIn([16, 2, 2], grid.getParentTiles(*child, 16))
+
+        # Children are limited to the extent
+        self.assertEqual(len(grid.getChildTiles(0, 0, 0, 20)), grid.numberOfTilesAtZoom(20))
+
+        with self.assertRaises(AssertionError):
+            grid.getChildTiles(16, 2, 2, 15)
+        with self.assertRaises(AssertionError):
+            grid.getParentTiles(16, 2, 2, 17)
+
+    def testParentsFloatNoise(self):
+        grid = GlobalMercatorTileGrid(useSwissExtent=False)
+        self.assertEqual(grid.getParentTiles(12, 496, 1041, 9), [[9, 62, 130]])
+        grid = GeoadminTileGridLV03()
+        # 0.1m tiles, 0.25m parents, 5 children for 2 parents
+        self.assertEqual(grid.getParentTiles(28, 4, 0, 27), [[27, 1, 0]])
+        self.assertEqual(grid.getParentTiles(28, 5, 0, 27), [[27, 2, 0]])
+        self.assertEqual(grid.getParentTiles(28, 2, 0, 27), [[27, 0, 0], [27, 1, 0]])
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def testTileRanges(self):
+        grid = GeoadminTileGridLV95(originCorner='bottom-left')
+        [minRow, minCol, maxRow, maxCol] = grid.getExtentAddress(19)
+        cols, rows = np.meshgrid(np.arange(minCol, maxCol + 1), np.arange(minRow, maxRow + 1))
+        for zoomParent in (0, 14, 17, 19):
+            ranges = grid.getParentTileRanges(19, cols, rows, zoomParent)
+            for i, (col, row) in enumerate(zip(cols.ravel(), rows.ravel())):
+                [r0, c0, r1, c1] = ranges[i].tolist()
+                self.assertEqual(
+                    grid.getParentTiles(19, int(col), int(row), zoomParent),
+                    [[zoomParent, c, r] for c in range(c0, c1 + 1) for r in range(r0, r1 + 1)]
+                )
+        ranges = grid.getChildTileRanges(16, [0, 1, 2], [0, 1, 2], 18)
+        for i, col in enumerate([0, 1, 2]):
+            [r0, c0, r1, c1] = ranges[i].tolist()
+            self.assertEqual(
+                grid.getChildTiles(16, col, col, 18),
+                [[18, c, r] for c in range(c0, c1 + 1) for r in range(r0, r1 + 1)]
+            )
+
+        # Parents without children within the extent give empty ranges
+        grid = GeoadminTileGridLV95()
+        for (zoom, col, row, zoomChild) in ((14, 2, 2, 14), (14, 50, 50, 16), (14, 0, 0, 16)):
+            [[r0, c0, r1, c1]] = grid.getChildTileRanges(zoom, [col], [row], zoomChild).tolist()
+            self.assertEqual(
+                grid.getChildTiles(zoom, col, row, zoomChild),
+                [[zoomChild, c, r] for c in range(c0, c1 + 1) for r in range(r0, r1 + 1)]
+            )
+        self.assertEqual(grid.getChildTiles(14, 2, 2, 14), [])
+        ranges = grid.getChildTileRanges(14, [2, 50], [2, 50], 14)
+        self.assertTrue(np.all((ranges[:, 0] > ranges[:, 2]) | (ranges[:, 1] > ranges[:, 3])))
+
+
+class TestTileGridInstance(unittest.TestCase):
+
+    def setUp(self):
+        clearTileGridCache()
+
+    def testGetTileGridInstance(self):
+        grid = getTileGridInstance(21781)
+        self.assertIsInstance(grid, GeoadminTileGridLV03)
+        self.assertIs(getTileGridInstance(21781), grid)
+        self.assertIs(getTileGridInstance(21781, tileSizePx=256), grid)
+        self.assertIsNot(getTileGridInstance(21781, originCorner='bottom-left'), grid)
+        self.assertIsNotNone(grid._zoomTable)
+        self.assertIsNotNone(grid._zoomRatios)
+
+        extent = [430000.0, 40000.0, 890000.0, 340000.0]
+        gridExtent = getTileGridInstance(21781, extent=extent)
+        self.assertIs(getTileGridInstance(21781, extent=tuple(extent)), gridExtent)
+        self.assertEqual(list(gridExtent.extent), extent)
+
+        geodetic = getTileGridInstance(4326)
+        self.assertIs(getTileGridInstance(4326, tmsCompatible=True), geodetic)
+        self.assertEqual(
+            list(geodetic.RESOLUTIONS), GlobalGeodeticTileGrid(tmsCompatible=True).RESOLUTIONS
+        )
+        self.assertNotEqual(
+            getTileGridInstance(4326, tmsCompatible=False).RESOLUTIONS, geodetic.RESOLUTIONS
+        )
+
+        info = getTileGridCacheInfo()
+        self.assertEqual(info.misses, 5)
+        self.assertEqual(info.hits, 4)
+        self.assertEqual(info.currsize, 5)
+
+        with self.assertRaises(AssertionError):
+            getTileGridInstance(7008)
+        with self.assertRaises(AssertionError):
+            getTileGridInstance(2056, tmsCompatible=True)
+
+    def testFrozenInstance(self):
+        grid = getTileGridInstance(2056)
+        self.assertIsInstance(grid.extent, tuple)
+        self.assertIsInstance(grid.zoomTable[0]['extentAddress'], tuple)
+        with self.assertRaises(AttributeError):
+            grid.extent = [2420000.0, 1030000.0, 2900000.0, 1350000.0]
+        with self.assertRaises(AttributeError):
+            grid.MINX = 0.0
+        with self.assertRaises(AttributeError):
+            del grid.originCorner
+        with self.assertRaises(TypeError):
+            grid.extent[0] = 0.0
+        with self.assertRaises(TypeError):
+            grid.zoomTable[0]['nbTiles'] = 0
+        # The lazy caches still work
+        self.assertEqual(grid.getCeilingZoom(grid.getResolution(10)), 10)
+        self.assertEqual(grid.tileAddress(0, [2600000.0, 1200000.0]), [0, 0])
+        # Instances created directly stay mutable
+        GeoadminTileGridLV95().extent = [2420000.0, 1030000.0, 2900000.0, 1350000.0]
+
+    def testUseTileTypesKey(self):
+        grid = getTileGridInstance(2056)
+        typed = getTileGridInstance(2056, useTileTypes=True)
+        self.assertIsNot(grid, typed)
+        self.assertIs(getTileGridInstance(2056, useTileTypes=True), typed)
+        self.assertFalse(grid.useTileTypes)
+        self.assertTrue(typed.useTileTypes)
+
+
+class TestTileGridAsync(unittest.TestCase):
+
+    def testAiterGrid(self):
+        grid = GeoadminTileGridLV95()
+
+        async def collect():
+            return [batch async for batch in grid.aiterGrid(14, 17, batchSize=100)]
+
+        batches = asyncio.run(collect())
+        self.assertTrue(all(len(batch) == 100 for batch in batches[:-1]))
+        self.assertTrue(0 < len(batches[-1]) <= 100)
+        self.assertEqual([t for batch in batches for t in batch], list(grid.iterGrid(14, 17)))
+
+        async def collectOrder():
+            return [
+                t async for batch in grid.aiterGrid(17, 17, order='hilbert', batchSize=7)
+                for t in batch
+            ]
+
+        self.assertEqual(asyncio.run(collectOrder()), list(grid.iterGrid(17, 17, order='hilbert')))
+
+    def testAiterGridYieldsToEventLoop(self):
+        grid = GeoadminTileGridLV95()
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.ensure_future(ticker())
+            nbBatches = 0
+            async for batch in grid.aiterGrid(16, 18, batchSize=50):
+                nbBatches += 1
+            task.cancel()
+            return nbBatches
+
+        nbBatches = asyncio.run(run())
+        self.assertGreaterEqual(len(ticks), nbBatches - 1)
+
+    def testFillGridQueue(self):
+        grid = GeoadminTileGridLV95()
+        maxSizes = []
+
+        async def run():
+            queue = asyncio.Queue(maxsize=2)
+            producer = asyncio.ensure_future(grid.fillGridQueue(queue, 14, 18, batchSize=64))
+            tiles = []
+            while True:
+                maxSizes.append(queue.qsize())
+                batch = await queue.get()
+                if batch is None:
+                    break
+                tiles.extend(batch)
+                await asyncio.sleep(0)
+            return tiles, await producer
+
+        tiles, nbTiles = asyncio.run(run())
+        self.assertEqual(nbTiles, grid.totalNumberOfTiles(14, 18))
+        self.assertEqual(tiles, list(grid.iterGrid(14, 18)))
+        self.assertLessEqual(max(maxSizes), 2)
+
+
+class TestTileGridIndex(unittest.TestCase):
+
+    def testTileAtIndex(self):
+        for grid in (GeoadminTileGridLV95(), GlobalGeodeticTileGrid(useSwissExtent=False)):
+            tiles = [t[1:] for t in grid.iterGrid(3, 9)]
+            for index in list(range(0, len(tiles), 97)) + [len(tiles) - 1]:
+                [zoom, col, row] = grid.tileAtIndex(index, 3, 9)
+                self.assertEqual((zoom, col, row), tiles[index])
+                self.assertEqual(grid.indexOfTile(zoom, col, row, 3, 9), index)
+            with self.assertRaises(AssertionError):
+                grid.tileAtIndex(len(tiles), 3, 9)
+            with self.assertRaises(AssertionError):
+                grid.indexOfTile(2, 0, 0, 3, 9)
+
+        grid = GeoadminTileGridLV95(useTileTypes=True)
+        self.assertEqual(grid.tileAtIndex(0, 20, 22), TileAddress(20, 0, 0))
+        self.assertEqual(grid.indexOfTile(20, 0, 0, 20, 22), 0)
+        nbTiles = grid.totalNumberOfTiles(20, 22)
+        self.assertEqual(grid.indexOfTile(*grid.tileAtIndex(nbTiles - 1, 20, 22), 20, 22),
+                         nbTiles - 1)
+
+    def testIterGridSlice(self):
+        grid = GeoadminTileGridLV95()
+        for order in ('row-major', 'z-order', 'hilbert'):
+            tiles = list(grid.iterGrid(12, 17, order=order))
+            for start, stop in ((0, 1), (5, 12), (3, None), (None, 40), (100, 101),
+                                (len(tiles) - 3, len(tiles) + 10), (len(tiles), None),
+                                (10, 10), (20, 5), (1, 1000)):
+                self.assertEqual(
+                    list(grid.iterGrid(12, 17, order=order, start=start, stop=stop)),
+                    tiles[start:stop]
+                )
+        # Jumps directly to a tile of a large zoom level
+        nbTiles = grid.totalNumberOfTiles(0, 28)
+        tiles = list(grid.iterGrid(0, 28, start=nbTiles - 3))
+        self.assertEqual([t[1:] for t in tiles],
+                         [tuple(grid.tileAtIndex(i, 0, 28)) for i in range(nbTiles - 3, nbTiles)])
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestTileGridZoomBatch(unittest.TestCase):
+
+    def _resolutions(self, grid):
+        resolutions = grid.RESOLUTIONS
+        values = list(resolutions) + [0.0, resolutions[0] * 10, resolutions[-1] / 10]
+        values += [r * 1.0000001 for r in resolutions] + [r * 0.9999999 for r in resolutions]
+        # Exactly halfway between two resolutions
+        values += [(a + b) / 2 for a, b in zip(resolutions, resolutions[1:])]
+        values += list(np.linspace(0, resolutions[0] * 2, 1000))
+        values += list(np.geomspace(resolutions[-1] / 4, resolutions[0] * 4, 1000))
+        return values
+
+    def testClosestAndCeilingZooms(self):
+        grids = (
+            GeoadminTileGridLV03(),
+            GeoadminTileGridLV95(),
+            GlobalMercatorTileGrid(),
+            GlobalGeodeticTileGrid(tmsCompatible=False)
+        )
+        for grid in grids:
+            values = self._resolutions(grid)
+            for unit in ('meters', 'degrees'):
+                zooms = grid.getClosestZooms(values, unit=unit)
+                self.assertEqual(zooms.dtype, np.int64)
+                self.assertEqual(zooms.tolist(), [grid.getClosestZoom(v, unit) for v in values])
+                zooms = grid.getCeilingZooms(np.array(values), unit=unit)
+                self.assertEqual(zooms.tolist(), [grid.getCeilingZoom(v, unit) for v in values])
+
+    def testScales(self):
+        grid = GeoadminTileGridLV95()
+        scales = np.array([grid.getScale(z) for z in range(0, len(grid.RESOLUTIONS))])
+        self.assertEqual(
+            grid.getClosestZooms(scales, unit='scale').tolist(),
+            list(range(0, len(grid.RESOLUTIONS)))
+        )
+        for tileGrid in (grid, GlobalGeodeticTileGrid(), GlobalMercatorTileGrid()):
+            zooms = list(range(0, len(tileGrid.RESOLUTIONS)))
+            scales = [tileGrid.getScale(z) for z in zooms]
+            self.assertEqual(tileGrid.getCeilingZooms(scales, unit='scale').tolist(), zooms)
+            self.assertEqual(tileGrid.getClosestZooms(scales, unit='scale').tolist(), zooms)
+        self.assertEqual(grid.getCeilingZooms([grid.getScale(28)], unit='scale').tolist(), [28])
+        scales = np.array([[1000.0, 25000.0], [500000.0, 1.0]])
+        zooms = grid.getCeilingZooms(scales, unit='scale')
+        self.assertEqual(zooms.shape, (2, 2))
+        self.assertEqual(
+            zooms.ravel().tolist(), [grid.getCeilingZoom(s * 0.00028) for s in scales.ravel()]
+        )
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from gatilegrid import GeoadminTileGridLV03
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import GlobalGeodeticTileGrid
+from gatilegrid import TileAddress
+from gatilegrid import TileBounds
+from gatilegrid import TileListReader
+from gatilegrid import TileListWriter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestTileList(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpDir.name, 'tiles.bin')
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def testWriteRead(self):
+        grid = GeoadminTileGridLV95()
+        tiles = list(grid.iterGrid(10, 17))
+        with TileListWriter(self.path, grid, bufferSize=100) as writer:
+            writer.writeTiles(tiles)
+            writer.write(20, 5, 7)
+        self.assertEqual(os.path.getsize(self.path), 70 + 9 * (len(tiles) + 1))
+
+        with TileListReader(self.path, grid) as reader:
+            self.assertEqual(len(reader), len(tiles) + 1)
+            self.assertFalse(reader.withBounds)
+            self.assertEqual(reader.spatialReference, 2056)
+            self.assertEqual(reader.extent, grid.extent)
+            self.assertEqual(reader[0], TileAddress(10, 0, 0))
+            self.assertEqual(reader[-1], TileAddress(20, 5, 7))
+            self.assertEqual(reader[123], TileAddress(*tiles[123][1:]))
+            self.assertEqual(list(reader)[:-1], [TileAddress(*t[1:]) for t in tiles])
+            with self.assertRaises(IndexError):
+                reader[len(tiles) + 1]
+            with self.assertRaises(AssertionError):
+                reader.tileBounds(0)
+
+        with self.assertRaises(AssertionError):
+            TileListReader(self.path, GeoadminTileGridLV03())
+
+    def testBounds(self):
+        grid = GeoadminTileGridLV95(originCorner='bottom-left')
+        tiles = list(grid.iterGrid(14, 16))
+        with TileListWriter(self.path, grid, withBounds=True) as writer:
+            writer.writeTiles(tiles)
+            writer.write(17, 1, 2)
+        with TileListReader(self.path, grid) as reader:
+            self.assertTrue(reader.withBounds)
+            self.assertEqual(reader.originCorner, 'bottom-left')
+            self.assertEqual(reader.tileBounds(5), TileBounds(*tiles[5][0]))
+            self.assertEqual(reader.tileBounds(-1), TileBounds(*grid.tileBounds(17, 1, 2)))
+            self.assertEqual(
+                [(list(t[0]),) + t[1:] for t in reader.iterTiles()][:-1],
+                [tuple(t) for t in tiles]
+            )
+
+    def testUnclosed(self):
+        grid = GeoadminTileGridLV95()
+        writer = TileListWriter(self.path, grid, bufferSize=10)
+        writer.writeTiles(grid.iterGrid(14, 15))
+        with self.assertRaises(AssertionError):
+            TileListReader(self.path)
+        writer.close()
+        with TileListReader(self.path) as reader:
+            self.assertEqual(len(reader), grid.totalNumberOfTiles(14, 15))
+
+    def testResolutions(self):
+        grid = GlobalGeodeticTileGrid(tmsCompatible=True)
+        with TileListWriter(self.path, grid) as writer:
+            writer.write(5, 1, 2)
+        with TileListReader(self.path, GlobalGeodeticTileGrid(tmsCompatible=True)) as reader:
+            self.assertEqual(reader[0], TileAddress(5, 1, 2))
+        with self.assertRaises(AssertionError):
+            TileListReader(self.path, GlobalGeodeticTileGrid(tmsCompatible=False))
+
+    def testAborted(self):
+        grid = GeoadminTileGridLV95()
+        with self.assertRaises(ValueError):
+            with TileListWriter(self.path, grid) as writer:
+                writer.writeTiles(grid.iterGrid(10, 11))
+                raise ValueError('Export failed')
+        self.assertFalse(os.path.exists(self.path))
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def testBlocks(self):
+        grid = GeoadminTileGridLV95()
+        for withBounds in (False, True):
+            with TileListWriter(self.path, grid, withBounds=withBounds) as writer:
+                writer.writeBlocks(grid.iterGridBlocks(14, 17, blockSize=1000))
+            with TileListReader(self.path, grid) as reader:
+                tiles = list(grid.iterGrid(14, 17))
+                self.assertEqual(list(reader), [TileAddress(*t[1:]) for t in tiles])
+                if withBounds:
+                    self.assertEqual([list(t[0]) for t in reader.iterTiles()],
+                                     [t[0] for t in tiles])
+                records = reader.records()
+                self.assertEqual(len(records), len(tiles))
+                self.assertEqual(records['tileCol'][7], tiles[7][2])
+                self.assertEqual(records['tileRow'][-1], tiles[-1][3])
+                del records
@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from gatilegrid import GeoadminTileGridLV95
+from gatilegrid import TileAddress
+from gatilegrid import TileRangeSet
+
+
+def _tiles(tileRangeSet):
+    return set(tileRangeSet)
+
+
+class TestTileRangeSet(unittest.TestCase):
+
+    def testFromExtentAddress(self):
+        grid = GeoadminTileGridLV95()
+        zoom = 20
+        tiles = TileRangeSet.fromExtentAddress(zoom, grid.getExtentAddress(zoom))
+        self.assertEqual(len(tiles), grid.numberOfTilesAtZoom(zoom))
+        self.assertEqual(
+            [list(t) for t in tiles], [[z, c, r] for (b, z, c, r) in grid.iterGrid(zoom, zoom)]
+        )
+        self.assertIn([zoom, 0, 0], tiles)
+        self.assertIn(TileAddress(zoom, 187, 124), tiles)
+        self.assertNotIn([zoom, 188, 124], tiles)
+        self.assertNotIn([zoom + 1, 0, 0], tiles)
+        self.assertFalse(TileRangeSet.fromExtentAddress(zoom, [2, 0, 1, 0]))
+
+    def testSetAlgebra(self):
+        zoom = 12
+        a = TileRangeSet.fromExtentAddress(zoom, [0, 0, 9, 9])
+        b = TileRangeSet.fromExtentAddress(zoom, [5, 5, 14, 14])
+        self.assertEqual(len(a | b), 100 + 100 - 25)
+        self.assertEqual(len(a & b), 25)
+        self.assertEqual(len(a - b), 75)
+        self.assertEqual(len(b - a), 75)
+        self.assertEqual(a & b, TileRangeSet.fromExtentAddress(zoom, [5, 5, 9, 9]))
+        self.assertEqual(_tiles(a - b), _tiles(a) - _tiles(b))
+        self.assertEqual(((a - b) | (a & b)), a)
+        # Adjacent ranges are merged
+        c = TileRangeSet.fromExtentAddress(zoom, [10, 0, 19, 9])
+        self.assertEqual((a | c).bands, ((0, 19, ((0, 9),)),))
+
+        with self.assertRaises(AssertionError):
+            a | TileRangeSet.fromExtentAddress(zoom + 1, [0, 0, 1, 1])
+
+    def testRandomAgainstPythonSets(self):
+        random.seed(42)
+        zoom = 18
+        for _ in range(30):
+            sets = []
+            for _ in range(2):
+                ranges = []
+                for _ in range(random.randint(0, 12)):
+                    row = random.randint(0, 15)
+                    minCol = random.randint(0, 20)
+                    ranges.append([row, minCol, minCol + random.randint(0, 6)])
+                sets.append(TileRangeSet.fromRanges(zoom, ranges))
+            a, b = sets
+            self.assertEqual(_tiles(a | b), _tiles(a) | _tiles(b))
+            self.assertEqual(_tiles(a & b), _tiles(a) & _tiles(b))
+            self.assertEqual(_tiles(a - b), _tiles(a) - _tiles(b))
+            self.assertEqual(len(a | b), len(_tiles(a) | _tiles(b)))
+            for tile in _tiles(a):
+                self.assertIn(tile, a)
+            for tile in _tiles(b) - _tiles(a):
+                self.assertNotIn(tile, a)
+
+    def testFromPolygon(self):
+        grid = GeoadminTileGridLV95()
+        zoom = 17
+        ring = [[2600000, 1200000], [2700000, 1200000], [2650000, 1280000]]
+        tiles = TileRangeSet.fromRanges(zoom, grid.getPolygonAddressRanges(zoom, ring))
+        self.assertEqual(len(tiles), grid.numberOfTilesInPolygon(ring, zoom))
+        self.assertEqual(
+            list(tiles.iterRanges()), grid.getPolygonAddressRanges(zoom, ring)
+        )
+
+    def testFromExtentAddresses(self):
+        zoom = 10
+        extentAddresses = [[0, 0, 9, 9], [5, 5, 14, 14], [20, 0, 19, 3], [30, 30, 30, 30]]
+        tiles = TileRangeSet.fromExtentAddresses(zoom, extentAddresses)
+        expected = TileRangeSet(zoom)
+        for extentAddress in extentAddresses:
+            expected = expected | TileRangeSet.fromExtentAddress(zoom, extentAddress)
+        self.assertEqual(tiles, expected)
+        self.assertEqual(len(tiles), 100 + 100 - 25 + 1)
+        self.assertFalse(TileRangeSet.fromExtentAddresses(zoom, []))